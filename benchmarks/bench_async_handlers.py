@@ -0,0 +1,95 @@
+"""
+Throughput and latency of threadpool (``def``) and async (``async def``) handlers under load
+
+Serves the same in-memory user lookup from a ``def`` endpoint, which Starlette runs on its
+threadpool (40 threads by default), and from an ``async def`` endpoint, which runs on the event loop.
+Each round fires ``--concurrency`` requests at once through httpx's ASGI transport, so no sockets or
+server are involved and the difference is the cost of the threadpool hop and its concurrency cap.
+
+Usage, from the repository root::
+
+    python -m benchmarks.bench_async_handlers [--concurrency 1000] [--rounds 5] [--users 10000]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from python_fastapi.projections import serialize_user
+from python_fastapi.repositories import UserRepository
+from python_fastapi.seed import generate_users, load_users
+
+
+def build_app(repository: UserRepository) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/threadpool/{user_id}")
+    def get_user_threadpool(user_id: int) -> dict:
+        return serialize_user(repository.get(user_id))
+
+    @app.get("/async/{user_id}")
+    async def get_user_async(user_id: int) -> dict:
+        return serialize_user(repository.get(user_id))
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, user_ids: list[int], concurrency: int, rounds: int) -> tuple[float, list[float]]:
+    """
+    Send rounds of concurrent GET requests
+
+    :param app: The application to call
+    :param path: The path prefix of the endpoint, the user id is appended
+    :param user_ids: The ids of the users to request, cycled through
+    :param concurrency: The number of requests in flight at once
+    :param rounds: The number of rounds to send
+    :return: The requests per second and the latency of every request in milliseconds
+    """
+    latencies = []
+
+    async def call(client: httpx.AsyncClient, user_id: int) -> None:
+        started_at = time.perf_counter()
+        response = await client.get(f"{path}/{user_id}")
+        latencies.append((time.perf_counter() - started_at) * 1000)
+        response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await asyncio.gather(*(call(client, user_id) for user_id in user_ids[:100]))
+        latencies.clear()
+
+        started_at = time.perf_counter()
+        for round_index in range(rounds):
+            offset = round_index * concurrency
+            await asyncio.gather(*(
+                call(client, user_ids[(offset + index) % len(user_ids)]) for index in range(concurrency)
+            ))
+        elapsed = time.perf_counter() - started_at
+    return concurrency * rounds / elapsed, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=1000, help="Requests in flight at once")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds of concurrent requests per path")
+    parser.add_argument("--users", type=int, default=10000, help="Users in the repository")
+    args = parser.parse_args()
+
+    repository = UserRepository()
+    load_users(repository, generate_users(args.users))
+    user_ids = [user["id"] for user in repository.users]
+    app = build_app(repository)
+
+    print(f"{'path':<12}{'requests/s':>12}{'p50':>10}{'p99':>10}")
+    for path in ("/threadpool", "/async"):
+        throughput, latencies = asyncio.run(drive(app, path, user_ids, args.concurrency, args.rounds))
+        percentiles = statistics.quantiles(latencies, n=100)
+        p50, p99 = percentiles[49], percentiles[98]
+        print(f"{path:<12}{throughput:>12.0f}{p50:>7.1f} ms{p99:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cold-start benchmark for both applications
+
+Every measurement runs in a fresh interpreter so module caches do not leak between runs. The test
+client is imported before timing starts, so it is excluded from every phase. For each
+application it reports the time to import the package, to build the app with ``create_app``, to run
+the lifespan startup (warm-up), and to serve the first and second requests.
+
+Usage, from the repository root::
+
+    python -m benchmarks.bench_cold_start [--runs 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, time
+from starlette.testclient import TestClient
+t0 = time.perf_counter()
+import {module} as target
+t1 = time.perf_counter()
+from {settings_module} import Settings
+app = target.create_app(Settings(prebuild_openapi={warm}, warm_validators={warm}))
+t2 = time.perf_counter()
+with TestClient(app) as client:
+    t3 = time.perf_counter()
+    client.get("{path}")
+    client.get("/openapi.json")
+    t4 = time.perf_counter()
+    client.get("{path}")
+    client.get("/openapi.json")
+    t5 = time.perf_counter()
+print(json.dumps({{
+    "import": t1 - t0, "create_app": t2 - t1, "startup": t3 - t2,
+    "first_response": t4 - t3, "second_response": t5 - t4,
+}}))
+"""
+
+TARGETS = {
+    "python_fastapi": ("python_fastapi.app", "python_fastapi.settings", "/api/v1/users"),
+    "patient_management_system": (
+        "patient_management_system.app.main", "patient_management_system.app.settings", "/api/v1/users"
+    ),
+}
+
+
+def run_probe(module: str, settings_module: str, path: str, warm: bool) -> dict:
+    """
+    Run one cold start in a fresh interpreter
+
+    :param module: The module exposing ``create_app``
+    :param settings_module: The module exposing ``Settings``
+    :param path: The path to request
+    :param warm: Whether to prebuild the OpenAPI schema and warm the validators at startup
+    :return: The timings of each phase in seconds
+    """
+    code = PROBE.format(module=module, settings_module=settings_module, path=path, warm=warm)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per configuration")
+    args = parser.parse_args()
+
+    phases = ("import", "create_app", "startup", "first_response", "second_response")
+    print(f"{'application':<28}{'warm-up':<9}" + "".join(f"{phase:>17}" for phase in phases))
+    for name, (module, settings_module, path) in TARGETS.items():
+        for warm in (False, True):
+            runs = [run_probe(module, settings_module, path, warm) for _ in range(args.runs)]
+            medians = [statistics.median(run[phase] for run in runs) * 1000 for phase in phases]
+            print(f"{name:<28}{'on' if warm else 'off':<9}" + "".join(f"{median:>14.2f} ms" for median in medians))
+
+
+if __name__ == "__main__":
+    main()
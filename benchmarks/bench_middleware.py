@@ -0,0 +1,93 @@
+"""
+Per-request overhead of the request context middleware
+
+Compares the same endpoint served with no middleware, with the previous ``@app.middleware("http")``
+function (which Starlette runs through ``BaseHTTPMiddleware``), and with the pure ASGI
+``RequestContextMiddleware``. Requests are driven straight through the ASGI interface so no HTTP
+client or server time is included.
+
+Usage, from the repository root::
+
+    python -m benchmarks.bench_middleware [--requests 20000]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from python_fastapi.middlewares import RequestContextMiddleware
+
+
+async def process_request_and_response(request: Request, call_next):
+    response = await call_next(request)
+    response.headers["X-Response-ID"] = str(random.randint(1, 1000000))
+    return response
+
+
+def build_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping", response_class=PlainTextResponse)
+    async def ping() -> str:
+        return "pong"
+
+    if middleware == "base_http":
+        app.middleware("http")(process_request_and_response)
+    elif middleware == "pure_asgi":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int, path: str = "/ping") -> float:
+    """
+    Send GET requests straight through the ASGI interface
+
+    :param app: The application to call
+    :param requests: The number of requests to send
+    :param path: The path to request
+    :return: The mean time per request in microseconds
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"testserver")], "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def call():
+        await app(dict(scope), receive, send)
+
+    for _ in range(200):
+        await call()
+
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return (time.perf_counter() - started_at) / requests * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per configuration")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration, the fastest is kept")
+    args = parser.parse_args()
+
+    results = {
+        middleware: min(asyncio.run(drive(build_app(middleware), args.requests)) for _ in range(args.repeat))
+        for middleware in ("none", "base_http", "pure_asgi")
+    }
+    print(f"{'middleware':<14}{'per request':>14}{'overhead':>12}")
+    for middleware, per_request in results.items():
+        print(f"{middleware:<14}{per_request:>11.1f} us{per_request - results['none']:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
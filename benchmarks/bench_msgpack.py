@@ -0,0 +1,72 @@
+"""
+Size, encode and decode time of a 1,000-user page in JSON and in MessagePack
+
+Builds the ``ResponseSchema`` envelope of a page of generated users the way the list endpoint does,
+then encodes it with the JSON response class FastAPI uses by default and with the negotiated
+MessagePack encoding, and decodes it back the way a client would. MessagePack is also measured with the
+timestamps left as strings, to separate the cost of converting them to integers.
+
+Usage, from the repository root::
+
+    python -m benchmarks.bench_msgpack [--users 1000] [--repeat 200]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+import msgpack
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from python_fastapi.content_negotiation import encode_timestamps
+from python_fastapi.projections import serialize_users
+from python_fastapi.schemas import ResponseSchema
+from python_fastapi.seed import generate_users
+
+
+def measure(function, repeat: int) -> float:
+    """
+    Time a function, keeping the fastest run
+
+    :param function: The function to call
+    :param repeat: The number of runs
+    :return: The fastest run in milliseconds
+    """
+    fastest = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        fastest = min(fastest, time.perf_counter() - started_at)
+    return fastest * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="Users in the page")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per measurement, the fastest is kept")
+    args = parser.parse_args()
+
+    users = next(generate_users(args.users, batch_size=args.users, now=datetime(2025, 1, 1, tzinfo=timezone.utc)))
+    page = jsonable_encoder(ResponseSchema(
+        success=True,
+        message="Users retrieved successfully",
+        data=serialize_users(users),
+        extras={"page": 1, "page_size": args.users, "total_users": args.users}
+    ))
+    encoders = {
+        "json": (lambda: JSONResponse(page).body, json.loads),
+        "msgpack": (lambda: msgpack.packb(encode_timestamps(page)), msgpack.unpackb),
+        "msgpack, timestamps left as strings": (lambda: msgpack.packb(page), msgpack.unpackb),
+    }
+
+    print(f"{'encoding':<38}{'size':>12}{'encode':>12}{'decode':>12}")
+    for name, (encode, decode) in encoders.items():
+        body = encode()
+        encode_ms = measure(encode, args.repeat)
+        decode_ms = measure(lambda: decode(body), args.repeat)
+        print(f"{name:<38}{len(body):>10} B{encode_ms:>9.2f} ms{decode_ms:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Serialization cost and payload size of sparse fieldsets
+
+Serializes a page of stored users the way ``GET /api/v1/users`` does, once with the full
+``ReadUserSchema`` and once per projection, and reports CPU time and JSON payload size.
+
+Usage, from the repository root::
+
+    python -m benchmarks.bench_projections [--rows 1000]
+"""
+import argparse
+import json
+import timeit
+
+from python_fastapi.projections import get_user_serializer, parse_user_fields
+from python_fastapi.schemas import ReadUserSchema
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Users per page")
+    parser.add_argument("--number", type=int, default=50, help="Pages serialized per measurement")
+    args = parser.parse_args()
+
+    page = [
+        {
+            "id": user_id,
+            "email": f"user{user_id}@ghs.gov.gh",
+            "username": f"user{user_id}",
+            "password": "secret123",
+            "created_at": "2025-01-01 10:00:00.000000+00:00",
+            "updated_at": "2025-02-01 10:00:00.000000+00:00",
+            "deleted_at": None,
+            "is_active": True
+        }
+        for user_id in range(args.rows)
+    ]
+
+    def full() -> list[dict]:
+        return [ReadUserSchema(**user).model_dump() for user in page]
+
+    variants = {"full ReadUserSchema": full}
+    for fields in ("id,username", "id,username,is_active", "id,username,created_at,updated_at,is_active"):
+        serializer = get_user_serializer(parse_user_fields(fields))
+        variants[f"fields={fields}"] = lambda serializer=serializer: [serializer(user) for user in page]
+
+    print(f"{'variant':<58}{'per page':>12}{'payload':>14}")
+    for name, serialize in variants.items():
+        per_page = min(timeit.repeat(serialize, number=args.number, repeat=3)) / args.number * 1000
+        payload = len(json.dumps(serialize()))
+        print(f"{name:<58}{per_page:>9.3f} ms{payload:>9} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Per-request overhead of Server-Timing stage timers
+
+Serves ``GET /api/v1/users/{user_id}`` with Server-Timing disabled, enabled, and enabled with
+histograms, driving requests straight through the ASGI interface.
+
+Usage, from the repository root::
+
+    python -m benchmarks.bench_server_timing [--requests 5000]
+"""
+import argparse
+import asyncio
+
+from benchmarks.bench_middleware import drive
+from python_fastapi.app import create_app
+from python_fastapi.seed import generate_users, load_users
+from python_fastapi.settings import Settings
+from python_fastapi.users_data import user_repository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per configuration")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration, the fastest is kept")
+    args = parser.parse_args()
+
+    load_users(user_repository, generate_users(1000))
+    path = f"/api/v1/users/{user_repository.users[0]['id']}"
+    configurations = {
+        "disabled": Settings(server_timing=False),
+        "enabled": Settings(server_timing=True),
+        "enabled with histograms": Settings(server_timing=True, server_timing_histograms=True),
+    }
+
+    results = {
+        name: min(asyncio.run(drive(create_app(settings), args.requests, path)) for _ in range(args.repeat))
+        for name, settings in configurations.items()
+    }
+    print(f"{'server timing':<26}{'per request':>14}{'overhead':>12}")
+    for name, per_request in results.items():
+        print(f"{name:<26}{per_request:>11.1f} us{per_request - results['disabled']:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
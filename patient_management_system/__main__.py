@@ -0,0 +1,4 @@
+from patient_management_system.app.server import main
+
+if __name__ == "__main__":
+    main()
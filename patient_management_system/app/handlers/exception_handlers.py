@@ -1,3 +1,10 @@
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+
+from patient_management_system.app.custom_exceptions.custom_http_exception import CustomHTTPException
+
+
 def value_error_exception_handler(request, exc):
     """
     Custom exception handler for ValueError.
@@ -12,4 +19,43 @@ def value_error_exception_handler(request, exc):
     # return JSONResponse(
     #     status_code=400,
     #     content={"message": str(exc)},
-    # )
\ No newline at end of file
+    # )
+
+
+def custom_http_exception_handler(request: Request, exc: CustomHTTPException):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "success": exc.success,
+            "message": exc.message,
+            "status_code": exc.status_code
+        }
+    )
+
+
+def request_validation_error_handler(request: Request, exc: RequestValidationError):
+    missing_attrs = []
+    invalid_data = []
+    errors = ""
+    _types = [error["type"] for error in exc.errors()]
+
+    for type_ in range(len(_types)):
+        if _types[type_] == "missing":
+            missing_attrs.append(exc.errors()[type_]["loc"][1])
+        if _types[type_] == "value_error":
+            invalid_data.append(exc.errors()[type_]["msg"])
+
+    if missing_attrs:
+        errors = errors + f"Fields required: {missing_attrs}"
+
+    if invalid_data:
+        errors = errors +  f" Invalid data: {invalid_data}"
+
+    return JSONResponse(
+        status_code=422,
+        content={
+            "success": False,
+            "message": "Validation Error",
+            "errors": errors
+        }
+    )
@@ -22,5 +22,5 @@ def get_users_list():
     Returns:
         list: List of user dictionaries.
     """
-    from app.dummy_data import users
+    from patient_management_system.app.dummy_data import users
     return users
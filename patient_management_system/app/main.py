@@ -1,55 +1,96 @@
-from fastapi import FastAPI, Request
-from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
-from app.custom_exceptions.custom_http_exception import CustomHTTPException
-from app.routes.api.v1.user import users_router
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-app = FastAPI()
+    from patient_management_system.app.settings import Settings
 
 
-@app.exception_handler(CustomHTTPException)
-def custom_http_exception_handler(request: Request, exc: CustomHTTPException):
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "success": exc.success,
-            "message": exc.message,
-            "status_code": exc.status_code
-        }
-    )
+def warm_up(app: "FastAPI", settings: "Settings") -> None:
+    """
+    Pay the one-off costs of the first request before serving traffic.
+
+    Args:
+        app: The application to warm up.
+        settings: The settings the application was created with.
+    """
+    if settings.prebuild_openapi:
+        app.openapi()
+
+    if settings.warm_validators:
+        from patient_management_system.app.schemas.users_schema import CreateUserSchema
+
+        CreateUserSchema.model_validate({"name": "Warmup", "email": "warmup@example.com"}).model_dump()
+
+
+@asynccontextmanager
+async def lifespan(app: "FastAPI") -> AsyncIterator[None]:
+    """
+    Lifespan hook that warms the application up before it starts serving requests.
+
+    The application reports ready once it is warm and stops reporting ready when it shuts down.
+
+    Args:
+        app: The application being started.
+    """
+    warm_up(app, app.state.settings)
+    app.state.ready = True
+    yield
+    app.state.ready = False
+
 
+def create_app(settings: Optional["Settings"] = None) -> "FastAPI":
+    """
+    Create and configure the application.
 
-@app.exception_handler(RequestValidationError)
-def request_validation_error_handler(request: Request, exc: RequestValidationError):
-    missing_attrs = []
-    invalid_data = []
-    errors = ""
-    _types = [error["type"] for error in exc.errors()]
-    print(_types)
-
-    for type_ in range(len(_types)):
-        if _types[type_] == "missing":
-            missing_attrs.append(exc.errors()[type_]["loc"][1])
-        if _types[type_] == "value_error":
-            invalid_data.append(exc.errors()[type_]["msg"])
-
-    # if _type == "missing":
-        # missing_attrs.append(exc.errors()[0]["loc"][1])
-
-    if missing_attrs:
-        errors = errors + f"Fields required: {missing_attrs}"
-
-    if invalid_data:
-        errors = errors +  f" Invalid data: {invalid_data}"
-
-    return JSONResponse(
-        status_code=422,
-        content={
-            "success": False,
-            "message": "Validation Error",
-            "errors": errors
-        }
+    FastAPI, the routes and their schemas are imported here rather than at module level so importing
+    the package stays cheap and every worker builds its own application.
+
+    Args:
+        settings: The settings to create the application with, read from the environment if omitted.
+
+    Returns:
+        FastAPI: The configured application.
+    """
+    from fastapi import FastAPI
+    from fastapi.exceptions import RequestValidationError
+
+    from patient_management_system.app.custom_exceptions.custom_http_exception import CustomHTTPException
+    from patient_management_system.app.handlers.exception_handlers import (
+        custom_http_exception_handler,
+        request_validation_error_handler
     )
+    from patient_management_system.app.middlewares import RequestContextMiddleware
+    from patient_management_system.app.routes.health import health_router
+    from patient_management_system.app.routes.api.v1.user import users_router
+    from patient_management_system.app.settings import get_settings
+
+    settings = settings or get_settings()
+
+    app = FastAPI(title=settings.title, version=settings.version, lifespan=lifespan)
+    app.state.settings = settings
+    app.state.ready = False
+    app.add_middleware(RequestContextMiddleware)
+    app.add_exception_handler(CustomHTTPException, custom_http_exception_handler)
+    app.add_exception_handler(RequestValidationError, request_validation_error_handler)
+    app.include_router(users_router)
+    app.include_router(health_router)
+
+    return app
+
+
+def __getattr__(name: str):
+    """
+    Build the module level ``app`` on first access, so ``uvicorn patient_management_system.app.main:app`` works.
+
+    Args:
+        name: The name of the attribute being looked up.
 
-app.include_router(users_router)
+    Returns:
+        FastAPI: The lazily created application.
+    """
+    if name == "app":
+        globals()["app"] = application = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
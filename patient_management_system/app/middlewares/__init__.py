@@ -0,0 +1,3 @@
+from patient_management_system.app.middlewares.request_context import RequestContextMiddleware, correlation_id
+
+__all__ = ["RequestContextMiddleware", "correlation_id"]
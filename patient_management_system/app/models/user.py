@@ -1,5 +1,5 @@
 import random
-from app.dummy_data import users
+from patient_management_system.app.dummy_data import users
 
 
 class User:
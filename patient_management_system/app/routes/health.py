@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Request, Response, status
+
+health_router = APIRouter(
+    prefix="/health",
+    tags=["Health"]
+)
+
+
+@health_router.get(path="/ready")
+async def get_readiness(request: Request, response: Response) -> dict:
+    """
+    Tell load balancers whether to send traffic to this worker.
+
+    Args:
+        request: The incoming request.
+        response: The response, whose status is set to 503 while the application is not ready.
+
+    Returns:
+        dict: Whether the application has warmed up and is not shutting down.
+    """
+    ready = request.app.state.ready
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"ready": ready}
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Runtime settings for the application, read from ``PATIENT_MANAGEMENT_*`` environment variables.
+    """
+    model_config = SettingsConfigDict(env_prefix="PATIENT_MANAGEMENT_")
+
+    title: str = "Patient Management System"
+    version: str = "0.1.0"
+    prebuild_openapi: bool = True
+    warm_validators: bool = True
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: Optional[int] = None
+    backlog: int = 2048
+    keep_alive_seconds: int = 5
+    graceful_shutdown_seconds: int = 30
+    reuse_port: bool = True
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Get the settings for the application.
+
+    Returns:
+        Settings: The settings read from the environment.
+    """
+    return Settings()
@@ -0,0 +1,4 @@
+from python_fastapi.server import main
+
+if __name__ == "__main__":
+    main()
@@ -1,145 +1,115 @@
-from datetime import datetime, timezone
-from typing import Annotated
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
-from fastapi import FastAPI, Body, Path, Query, status, HTTPException, Request
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-from python_fastapi.helper_functions import get_user_from_list
-from python_fastapi.schemas import ResponseSchema, ReadUserSchema, CreateUserSchema, UpdateUserSchema
-from python_fastapi.services import get_all_users_from_list, get_user_by_id, create_new_user, update_a_user
-from python_fastapi.users_data import users
-from python_fastapi.utils import generate_id
+    from python_fastapi.settings import Settings
 
-app = FastAPI()
 
-
-@app.middleware("http")
-async def process_request_and_response(request: Request, call_next):
+def warm_up(app: "FastAPI", settings: "Settings") -> None:
     """
-    Middleware to process request and response
+    Pay the one-off costs of the first request up front
 
-    :param request: Request
-    :param call_next: Callable
-    :return: Response
-    """
-    response = await call_next(request)
-    response.headers["X-Response-ID"] = str(generate_id())
-    return response
-
-@app.get(path="/api/v1/users", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
-def get_all_users(
-    request: Request,
-    page: Annotated[int, Query(description="The page number to get", ge=1)] = None,
-    page_size: Annotated[int, Query(description="The number of items to get per page", ge=1)] = None,
-    is_active: Annotated[bool, Query(description="Filter by active status")] = None,
-    is_deleted: Annotated[bool, Query(description="Filter by deleted status")] = None,
-) -> ResponseSchema:
-    """
-    Get all users
+    Building the OpenAPI schema caches it on ``app.openapi_schema`` so ``/openapi.json`` and ``/docs``
+    are served without regenerating it, and validating a sample payload through every schema
+    exercises the compiled pydantic validators and serializers before real traffic arrives.
 
-    :return: dict
+    :param app: The application to warm up
+    :param settings: The settings the application was created with
     """
-    response = get_all_users_from_list(
-        users=users, page=page, page_size=page_size, is_active=is_active, is_deleted=is_deleted)
-
-    return ResponseSchema(
-        success=True,
-        message="Users retrieved successfully",
-        data=[ReadUserSchema(**user).model_dump() for user in response],
-        extras={
-            "page": page,
-            "page_size": page_size,
-            "total_users": len(users)
+    if settings.prebuild_openapi:
+        app.openapi()
+
+    if settings.warm_validators:
+        from python_fastapi.schemas import CreateUserSchema, ReadUserSchema, ResponseSchema, UpdateUserSchema
+
+        sample_user = {
+            "id": 1,
+            "email": "warmup@ghs.gov.gh",
+            "username": "warmup",
+            "password": "warmup123",
+            "created_at": "2025-01-01 00:00:00.000000+00:00",
+            "updated_at": "2025-01-01 00:00:00.000000+00:00",
+            "is_active": True
         }
-    )
+        CreateUserSchema.model_validate(sample_user)
+        UpdateUserSchema.model_validate(sample_user)
+        read_user = ReadUserSchema.model_validate(sample_user).model_dump()
+        ResponseSchema(success=True, message="warmup", data=[read_user]).model_dump_json()
 
 
-@app.get(path="/api/v1/users/{user_id}", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
-def get_user(user_id: Annotated[int, Path(description="The id of the user to get")]) -> ResponseSchema:
+def seed_users(settings: "Settings") -> None:
     """
-    Get user by id
+    Load synthetic users into the user repository, for load testing
 
-    :param user_id: int
-    :return: dict
+    :param settings: The settings the application was created with
     """
-    user = get_user_by_id(user_id, users)
-    return ResponseSchema(
-            success=True,
-            message="Users retrieved successfully",
-            data=ReadUserSchema(**user).model_dump()
-        )
+    from python_fastapi.seed import generate_users, load_users
+    from python_fastapi.users_data import user_repository
 
+    load_users(user_repository, generate_users(settings.seed_users, settings.seed))
 
-@app.post(path="/api/v1/users", status_code=status.HTTP_201_CREATED, response_model=ResponseSchema)
-def create_user(user: CreateUserSchema = Body()) -> ResponseSchema:
-    """
-    Create a new user
 
-    :param user: dictionary containing user data
-    :return: dict
+@asynccontextmanager
+async def lifespan(app: "FastAPI") -> AsyncIterator[None]:
     """
-    new_user = create_new_user(user, users)
+    Lifespan hook that seeds and warms the application up before it starts serving requests
 
-    return ResponseSchema(
-            success=True,
-            message="User created successfully",
-            data=ReadUserSchema(**new_user.to_dict()).model_dump()
-    )
-
-
-@app.put(path="/api/v1/users/{user_id}", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
-def update_user(user_id: int = Path(), user_update_data: UpdateUserSchema = Body()) -> ResponseSchema:
-    """
-    Update user by id
+    The application only reports ready once it is warm, and stops as soon as it shuts down.
 
-    :param user_id: the id of the user to update
-    :param user_update_data: the new data to update the user with
-    :return: dict
+    :param app: FastAPI
     """
-    updated_user = update_a_user(user_id, user_update_data, users)
+    if app.state.settings.seed_users:
+        seed_users(app.state.settings)
+    warm_up(app, app.state.settings)
+    app.state.ready = True
+    yield
+    app.state.ready = False
 
-    return ResponseSchema(
-            success=True,
-            message="User created successfully",
-            data=ReadUserSchema(**updated_user.to_dict()).model_dump()
-    )
 
-
-@app.patch(path="/api/v1/users/{user_id}", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
-def update_user(user_id: int = Path(), user_update_data: UpdateUserSchema = Body()) -> ResponseSchema:
+def create_app(settings: Optional["Settings"] = None) -> "FastAPI":
     """
-    Update user by id
+    Create and configure the application
+
+    Heavy imports (FastAPI, the routes and their schemas) are deferred to this call so importing
+    the package stays cheap and every worker builds its own application.
 
-    :param user_id: the id of the user to update
-    :param user_update_data: the new data to update the user with
-    :return: dict
+    :param settings: The settings to create the application with, read from the environment if omitted
+    :return: FastAPI
     """
-    updated_user = update_a_user(user_id, user_update_data, users)
+    from fastapi import FastAPI
 
-    return ResponseSchema(
-            success=True,
-            message="User created successfully",
-            data=ReadUserSchema(**updated_user.to_dict()).model_dump()
-    )
+    from python_fastapi.middlewares import RequestContextMiddleware
+    from python_fastapi.routes import health_router, metrics_router, users_router
+    from python_fastapi.settings import get_settings
+    from python_fastapi.timing import ServerTimingMiddleware, StageHistograms
 
+    settings = settings or get_settings()
 
-@app.delete(path="/api/v1/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int = Path()) -> None:
-    """
-    Delete user by id
+    app = FastAPI(title=settings.title, version=settings.version, lifespan=lifespan)
+    app.state.settings = settings
+    app.state.ready = False
+    app.state.stage_histograms = StageHistograms() if settings.server_timing_histograms else None
+    if settings.server_timing:
+        app.add_middleware(ServerTimingMiddleware, histograms=app.state.stage_histograms)
+    app.add_middleware(RequestContextMiddleware)
+    app.include_router(users_router)
+    app.include_router(health_router)
+    if app.state.stage_histograms is not None:
+        app.include_router(metrics_router)
 
-    :param user_id: the id of the user to delete
-    :return: dict
-    """
-    user_to_delete = get_user_from_list(user_id, users)
+    return app
 
-    if not user_to_delete:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
-        # return {"error": "Not Found"}
 
-    # Alternate method to delete user
-    # del users[users.index(user_to_delete)]
-    # users.remove(user_to_delete)
-    user_to_delete["deleted_at"] = str(datetime.now(tz=timezone.utc))
+def __getattr__(name: str):
+    """
+    Build the module level ``app`` on first access, so ``uvicorn python_fastapi.app:app`` keeps working
 
-    # return {"message": "User deleted successfully"}
-    return None
+    :param name: The name of the attribute being looked up
+    :return: FastAPI
+    """
+    if name == "app":
+        globals()["app"] = application = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
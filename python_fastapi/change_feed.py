@@ -0,0 +1,175 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+from typing import AsyncIterator, Optional
+
+
+class ChangeFeed:
+    """
+    Bounded, in-memory log of user mutations
+
+    Every write appends an event carrying a monotonically increasing sequence number. Only the most
+    recent ``capacity`` events are kept; consumers whose position has been evicted from the buffer
+    must resync from a full read before following the feed again.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Constructor for ChangeFeed class
+
+        :param capacity: The maximum number of events kept in the buffer
+        """
+        self.__events: deque[dict] = deque(maxlen=capacity)
+        self.__last_sequence = 0
+        self.__lock = threading.Lock()
+        self.__waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+    @property
+    def last_sequence(self) -> int:
+        """
+        Getter for last_sequence
+
+        :return: The sequence number of the most recent event, 0 if nothing was published yet
+        """
+        return self.__last_sequence
+
+    @property
+    def first_sequence(self) -> int:
+        """
+        Getter for first_sequence
+
+        :return: The sequence number of the oldest event still in the buffer
+        """
+        with self.__lock:
+            return self.__first_sequence()
+
+    def publish(self, operation: str, user_id: int, data: dict) -> dict:
+        """
+        Append an event to the feed and wake up every consumer waiting for it
+
+        Safe to call from worker threads; waiting consumers are woken on their own event loop.
+
+        :param operation: The kind of mutation, one of create, update or delete
+        :param user_id: The id of the mutated user
+        :param data: The public representation of the user after the mutation
+        :return: The published event
+        """
+        with self.__lock:
+            self.__last_sequence += 1
+            event = {
+                "sequence": self.__last_sequence,
+                "operation": operation,
+                "user_id": user_id,
+                "occurred_at": str(datetime.now(tz=timezone.utc)),
+                "data": data
+            }
+            self.__events.append(event)
+            waiters, self.__waiters = self.__waiters, set()
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(ChangeFeed.__wake, future)
+        return event
+
+    def read(self, since: int, limit: int) -> tuple[list[dict], bool]:
+        """
+        Read the events published after a given sequence number
+
+        A consumer must resync when its position was evicted from the buffer, or when it is ahead of
+        the feed, which happens when it kept its cursor across a restart of the process.
+
+        :param since: The last sequence number the consumer has seen
+        :param limit: The maximum number of events to return
+        :return: The events, and whether the consumer must resync
+        """
+        with self.__lock:
+            first_sequence = self.__first_sequence()
+            if since + 1 < first_sequence or since > self.__last_sequence:
+                return [], True
+            start = since + 1 - first_sequence
+            return list(islice(self.__events, start, start + limit)), False
+
+    async def wait(self, since: int, timeout: float) -> bool:
+        """
+        Wait until an event newer than ``since`` is published
+
+        :param since: The last sequence number the consumer has seen
+        :param timeout: The maximum number of seconds to wait
+        :return: True if a newer event is available, False if the wait timed out
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self.__lock:
+            if self.__last_sequence > since:
+                return True
+            self.__waiters.add(waiter)
+
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self.__lock:
+                self.__waiters.discard(waiter)
+
+    def __first_sequence(self) -> int:
+        return self.__events[0]["sequence"] if self.__events else self.__last_sequence + 1
+
+    @staticmethod
+    def __wake(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+
+def format_server_sent_event(event: str, data: str, event_id: Optional[int] = None) -> str:
+    """
+    Format a message in the Server-Sent Events wire format
+
+    :param event: The event type
+    :param data: The already serialized payload
+    :param event_id: The id clients send back in Last-Event-ID when reconnecting
+    :return: str
+    """
+    message = f"event: {event}\ndata: {data}\n\n"
+    if event_id is not None:
+        message = f"id: {event_id}\n{message}"
+    return message
+
+
+async def stream_server_sent_events(
+    change_feed: ChangeFeed,
+    since: int,
+    batch_size: int,
+    heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    """
+    Follow the feed from a sequence number as a stream of Server-Sent Events
+
+    Events are pulled from the buffer at the pace the client consumes them, so a slow client only
+    holds a cursor rather than a growing queue. A client that falls so far behind that its cursor is
+    evicted gets a ``resync`` event carrying the current sequence number and the stream ends.
+
+    :param change_feed: The feed to follow
+    :param since: The last sequence number the client has seen
+    :param batch_size: The maximum number of events written per chunk
+    :param heartbeat_seconds: How long to stay silent before sending a keep-alive comment
+    :return: An async iterator of Server-Sent Events
+    """
+    cursor = since
+    while True:
+        events, resync = change_feed.read(cursor, batch_size)
+        if resync:
+            yield format_server_sent_event("resync", json.dumps({"last_sequence": change_feed.last_sequence}))
+            return
+
+        if events:
+            cursor = events[-1]["sequence"]
+            yield "".join(
+                format_server_sent_event(event["operation"], json.dumps(event), event["sequence"]) for event in events
+            )
+        elif not await change_feed.wait(cursor, heartbeat_seconds):
+            yield ": heartbeat\n\n"
@@ -0,0 +1,27 @@
+from functools import partial
+from typing import Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+from python_fastapi.constants import CPU_BOUND_OFFLOAD_THRESHOLD
+
+T = TypeVar("T")
+
+
+async def run_cpu_bound(function: Callable[..., T], *args, cost: int, **kwargs) -> T:
+    """
+    Run CPU-bound work without stalling the event loop for long
+
+    Handlers are async, so everything they run inline holds up every other request of the worker.
+    Small amounts of in-memory work are cheaper to run inline than to hand over to a thread, so work
+    is only moved to the threadpool once its cost reaches ``CPU_BOUND_OFFLOAD_THRESHOLD``.
+
+    :param function: The work to run
+    :param args: Positional arguments for the work
+    :param cost: The number of items the work goes through
+    :param kwargs: Keyword arguments for the work
+    :return: The result of the work
+    """
+    if cost < CPU_BOUND_OFFLOAD_THRESHOLD:
+        return function(*args, **kwargs)
+    return await run_in_threadpool(partial(function, *args, **kwargs))
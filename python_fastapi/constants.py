@@ -8,3 +8,34 @@ MINIMUM_PASSWORD_LENGTH = 8
 class GenderEnum(Enum):
     MALE = "male"
     FEMALE = "female"
+
+
+CHANGE_FEED_CAPACITY = 10_000
+
+CHANGE_FEED_BATCH_SIZE = 500
+
+CHANGE_FEED_MAX_WAIT_SECONDS = 30
+
+CHANGE_FEED_HEARTBEAT_SECONDS = 15
+
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 60 * 60
+
+IDEMPOTENCY_CACHE_MAX_ENTRIES = 10_000
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+BATCH_GET_MAX_IDS = 5_000
+
+MERGE_PATCH_MEDIA_TYPE = "application/merge-patch+json"
+
+NEW_SNAPSHOT = "new"
+
+SNAPSHOT_TTL_SECONDS = 5 * 60
+
+SNAPSHOT_MAX_LEASES = 1_000
+
+CPU_BOUND_OFFLOAD_THRESHOLD = 2_000
+
+MESSAGE_PACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+TIMESTAMP_FIELDS = frozenset({"created_at", "updated_at", "deleted_at", "occurred_at"})
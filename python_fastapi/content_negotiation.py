@@ -0,0 +1,147 @@
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Coroutine, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+
+from python_fastapi.constants import MESSAGE_PACK_MEDIA_TYPES, TIMESTAMP_FIELDS
+from python_fastapi.timing import TimedRoute
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional, JSON is always available
+    msgpack = None
+
+MESSAGE_PACK_MEDIA_TYPE = MESSAGE_PACK_MEDIA_TYPES[0]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+MICROSECOND = timedelta(microseconds=1)
+
+accepts_message_pack: ContextVar[bool] = ContextVar("accepts_message_pack", default=False)
+
+
+def is_message_pack(media_type: Optional[str]) -> bool:
+    """
+    Check whether a Content-Type or Accept header asks for MessagePack
+
+    :param media_type: The header value, None when the header is missing
+    :return: bool
+    """
+    return media_type is not None and any(candidate in media_type for candidate in MESSAGE_PACK_MEDIA_TYPES)
+
+
+def to_epoch_microseconds(timestamp: str) -> int:
+    """
+    Convert a stored timestamp to the number of microseconds since the Unix epoch
+
+    :param timestamp: A timestamp as stored, str(datetime) or ISO 8601, UTC when it has no offset
+    :return: int
+    """
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - EPOCH) // MICROSECOND
+
+
+def encode_timestamps(content: Any) -> Any:
+    """
+    Replace the timestamps of a JSON compatible payload by integers, as microseconds since the epoch
+
+    :param content: The payload, as produced by jsonable_encoder
+    :return: The payload with every timestamp field converted
+    """
+    if isinstance(content, list):
+        return [encode_timestamps(value) for value in content]
+    if not isinstance(content, dict):
+        return content
+
+    encoded = {}
+    for key, value in content.items():
+        if isinstance(value, (dict, list)):
+            value = encode_timestamps(value)
+        elif key in TIMESTAMP_FIELDS and isinstance(value, str):
+            value = to_epoch_microseconds(value)
+        encoded[key] = value
+    return encoded
+
+
+class MessagePackRequest(Request):
+    """
+    Request with a MessagePack body, presented to FastAPI as a JSON request so bodies are validated as usual
+    """
+
+    def __init__(self, scope, receive) -> None:
+        """
+        Constructor for MessagePackRequest class
+
+        :param scope: The ASGI scope of the request
+        :param receive: The ASGI receive channel of the request
+        """
+        headers = [(name, value) for name, value in scope["headers"] if name != b"content-type"]
+        headers.append((b"content-type", b"application/json"))
+        super().__init__({**scope, "headers": headers}, receive)
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            try:
+                self._json = msgpack.unpackb(await self.body())
+            except (ValueError, msgpack.UnpackException):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed MessagePack body.")
+        return self._json
+
+
+class NegotiatedResponse(JSONResponse):
+    """
+    JSON response that is encoded as MessagePack when the client accepts it
+
+    The envelope is the same in both encodings, except timestamps, which MessagePack carries as
+    integers of microseconds since the Unix epoch.
+    """
+
+    def __init__(self, content: Any, *args, **kwargs) -> None:
+        """
+        Constructor for NegotiatedResponse class
+
+        :param content: The JSON compatible content of the response
+        """
+        if accepts_message_pack.get():
+            self.media_type = MESSAGE_PACK_MEDIA_TYPE
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MESSAGE_PACK_MEDIA_TYPE:
+            return msgpack.packb(encode_timestamps(content))
+        return super().render(content)
+
+
+class NegotiatedRoute(TimedRoute):
+    """
+    Route accepting MessagePack request bodies and answering in MessagePack when asked to
+
+    JSON stays the default. Without the optional msgpack package, MessagePack bodies are refused
+    with 415 and responses are always JSON.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def negotiated_route_handler(request: Request) -> Response:
+            if is_message_pack(request.headers.get("content-type")):
+                if msgpack is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                        detail="MessagePack bodies are not supported by this server."
+                    )
+                request = MessagePackRequest(request.scope, request.receive)
+
+            token = accepts_message_pack.set(msgpack is not None and is_message_pack(request.headers.get("accept")))
+            try:
+                response = await route_handler(request)
+            finally:
+                accepts_message_pack.reset(token)
+            response.headers["Vary"] = "Accept"
+            return response
+
+        return negotiated_route_handler
@@ -0,0 +1,132 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from python_fastapi.constants import IDEMPOTENCY_CACHE_MAX_ENTRIES, IDEMPOTENCY_KEY_TTL_SECONDS
+
+T = TypeVar("T")
+
+
+class _Entry:
+    """
+    A cached outcome for one idempotency key, in flight until ``done`` is set
+    """
+
+    def __init__(self, fingerprint: str) -> None:
+        self.fingerprint = fingerprint
+        self.done = asyncio.Event()
+        self.completed = False
+        self.result = None
+        self.expires_at = float("inf")
+
+
+class IdempotencyCache:
+    """
+    TTL and size bounded cache of the results of idempotent writes
+
+    The first request for a key runs the operation and stores its result. Replays of the same request
+    are answered from the cache, and duplicates arriving while the first one is still running wait for
+    it instead of running the operation a second time. Failed operations are not cached, so a retry
+    after an error runs again.
+
+    The cache belongs to the event loop serving the requests: duplicates wait without blocking it,
+    and nothing awaits while the entries are being changed, so they need no lock.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        """
+        Constructor for IdempotencyCache class
+
+        :param ttl_seconds: How long a stored result is replayed for
+        :param max_entries: The maximum number of keys kept, oldest are evicted first
+        """
+        self.__ttl_seconds = ttl_seconds
+        self.__max_entries = max_entries
+        self.__entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    async def execute(self, key: str, fingerprint: str, operation: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run an operation at most once per idempotency key
+
+        :param key: The idempotency key sent by the client
+        :param fingerprint: A digest of the request, used to reject a key reused for another request
+        :param operation: The write to perform
+        :raise HTTPException: If the key was already used with a different request
+        :return: The result of the operation, and whether it was replayed from the cache
+        """
+        while True:
+            self.__evict_expired()
+            entry = self.__entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                entry = self.__entries[key] = _Entry(fingerprint)
+                self.__entries.move_to_end(key)
+                self.__evict_oversized()
+                is_owner = True
+            else:
+                is_owner = False
+
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used with a different request."
+                )
+
+            if is_owner:
+                return await self.__run(key, entry, operation), False
+
+            await entry.done.wait()
+            if entry.completed:
+                return entry.result, True
+
+    async def __run(self, key: str, entry: _Entry, operation: Callable[[], Awaitable[T]]) -> T:
+        try:
+            result = await operation()
+        except BaseException:
+            if self.__entries.get(key) is entry:
+                del self.__entries[key]
+            entry.done.set()
+            raise
+
+        entry.result = result
+        entry.expires_at = time.monotonic() + self.__ttl_seconds
+        entry.completed = True
+        entry.done.set()
+        return result
+
+    def __evict_expired(self) -> None:
+        # Entries are kept in insertion order, so the oldest, first to expire, are at the front
+        now = time.monotonic()
+        while self.__entries:
+            key, entry = next(iter(self.__entries.items()))
+            if entry.expires_at > now:
+                break
+            del self.__entries[key]
+
+    def __evict_oversized(self) -> None:
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+
+
+def request_fingerprint(method: str, path: str, body: str) -> str:
+    """
+    Digest the parts of a request that must match for a replay
+
+    :param method: The HTTP method
+    :param path: The request path
+    :param body: The canonical, already serialized request body
+    :return: str
+    """
+    return hashlib.sha256(f"{method} {path}\n{body}".encode()).hexdigest()
+
+
+idempotency_cache = IdempotencyCache(
+    ttl_seconds=IDEMPOTENCY_KEY_TTL_SECONDS,
+    max_entries=IDEMPOTENCY_CACHE_MAX_ENTRIES
+)
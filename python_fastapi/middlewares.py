@@ -0,0 +1,74 @@
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+CORRELATION_ID_HEADER = b"x-correlation-id"
+
+RESPONSE_ID_HEADER = b"x-response-id"
+
+PROCESS_TIME_HEADER = b"x-process-time"
+
+correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware tagging every request and response with identifiers and timing
+
+    The request id is taken from ``X-Request-ID`` or generated, and the correlation id is taken from
+    ``X-Correlation-ID`` or defaults to the request id. Both are stored in ``request.state`` and the
+    correlation id in the ``correlation_id`` context variable, so logs and outgoing calls can carry
+    it. Only the ``http.response.start`` message is touched, the body is passed through untouched,
+    which keeps streaming responses streaming.
+
+    It depends on nothing but the standard library, so any ASGI application can use it.
+    """
+
+    def __init__(self, app) -> None:
+        """
+        Constructor for RequestContextMiddleware class
+
+        :param app: The ASGI application to wrap
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        request_id = None
+        request_correlation_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+            elif name == CORRELATION_ID_HEADER:
+                request_correlation_id = value.decode("latin-1")
+        request_id = request_id or uuid.uuid4().hex
+        request_correlation_id = request_correlation_id or request_id
+
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["correlation_id"] = request_correlation_id
+
+        async def send_with_context(message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = (time.perf_counter() - started_at) * 1000
+                message = {**message, "headers": [
+                    *message.get("headers", ()),
+                    (REQUEST_ID_HEADER, request_id.encode("latin-1")),
+                    (RESPONSE_ID_HEADER, uuid.uuid4().hex.encode("latin-1")),
+                    (CORRELATION_ID_HEADER, request_correlation_id.encode("latin-1")),
+                    (PROCESS_TIME_HEADER, f"{process_time:.3f}".encode("latin-1"))
+                ]}
+            await send(message)
+
+        token = correlation_id.set(request_correlation_id)
+        try:
+            await self.app(scope, receive, send_with_context)
+        finally:
+            correlation_id.reset(token)
@@ -176,8 +176,8 @@ class User(PersistMixin):
             "username": self.__username,
             "password": self.__password,
             "created_at": str(self.__created_at),
-            "updated_at": str(self.__updated_at),
-            "deleted_at": str(self.__deleted_at),
+            "updated_at": None if self.__updated_at is None else str(self.__updated_at),
+            "deleted_at": None if self.__deleted_at is None else str(self.__deleted_at),
             "is_active": self.__is_active
         }
 
@@ -196,17 +196,17 @@ class User(PersistMixin):
         if created_at is None:
             _created_at = datetime.now(timezone.utc)
         else:
-            _created_at = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S.%fZ")
+            _created_at = datetime.fromisoformat(created_at)
 
         if updated_at is None:
             _updated_at = None
         else:
-            _updated_at = datetime.strptime(updated_at, "%Y-%m-%d %H:%M:%S.%fZ")
+            _updated_at = datetime.fromisoformat(updated_at)
 
         if deleted_at is None:
             _deleted_at = None
         else:
-            _deleted_at = datetime.strptime(deleted_at, "%Y-%m-%d %H:%M:%S.%fZ")
+            _deleted_at = datetime.fromisoformat(deleted_at)
         return _id, _created_at, _updated_at, _deleted_at
 
     @staticmethod
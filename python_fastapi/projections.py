@@ -0,0 +1,80 @@
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from python_fastapi.schemas import ReadUserSchema
+
+USER_FIELDS = tuple(ReadUserSchema.model_fields)
+
+
+def parse_user_fields(fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    """
+    Parse a ``fields=`` query parameter into a canonical projection
+
+    The requested fields are deduplicated and put in schema order, so equivalent requests share one
+    cached serializer.
+
+    :param fields: Comma separated field names, as sent by the client
+    :raise HTTPException: If a requested field is not part of ReadUserSchema
+    :return: The projection, or None to return every field
+    """
+    if fields is None:
+        return None
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(USER_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {sorted(unknown)}. Valid fields are: {list(USER_FIELDS)}"
+        )
+    if not requested:
+        return None
+    return tuple(field for field in USER_FIELDS if field in requested)
+
+
+@lru_cache(maxsize=2 ** len(USER_FIELDS))
+def get_user_serializer(fields: tuple[str, ...]) -> Callable[[dict], dict]:
+    """
+    Compile a serializer that copies only the projected fields of a stored user
+
+    Unrequested fields are never read, so they are neither validated nor formatted.
+
+    :param fields: A canonical projection returned by parse_user_fields
+    :return: A function turning a stored user into its projected representation
+    """
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda user: {field: user[field]}
+
+    getter = itemgetter(*fields)
+    return lambda user: dict(zip(fields, getter(user)))
+
+
+def serialize_user(user: dict, fields: Optional[tuple[str, ...]] = None) -> dict:
+    """
+    Serialize a stored user, optionally projected to a subset of fields
+
+    :param user: The stored user
+    :param fields: A canonical projection returned by parse_user_fields, None for every field
+    :return: dict
+    """
+    if fields is None:
+        return ReadUserSchema(**user).model_dump()
+    return get_user_serializer(fields)(user)
+
+
+def serialize_users(users: list[dict], fields: Optional[tuple[str, ...]] = None) -> list[dict]:
+    """
+    Serialize stored users, optionally projected to a subset of fields
+
+    :param users: The stored users
+    :param fields: A canonical projection returned by parse_user_fields, None for every field
+    :return: list[dict]
+    """
+    if fields is None:
+        return [ReadUserSchema(**user).model_dump() for user in users]
+    serializer = get_user_serializer(fields)
+    return [serializer(user) for user in users]
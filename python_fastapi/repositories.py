@@ -0,0 +1,323 @@
+import threading
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+from python_fastapi.stats import UserStatistics
+
+STATISTICS_FIELDS = frozenset({"is_active", "deleted_at", "created_at"})
+
+
+class DuplicateEmailError(ValueError):
+    """
+    Raised when a write would give two users the same email
+    """
+
+
+class DuplicateIdError(ValueError):
+    """
+    Raised when a write would give two users the same id
+    """
+
+
+class SnapshotExpiredError(LookupError):
+    """
+    Raised when reading a commit that is no longer pinned
+    """
+
+
+class UserRepository:
+    """
+    In-memory, multi-version store of users, indexed by id and by email
+
+    Users are kept in insertion order in ``users`` and every user is also reachable by id and by
+    email in O(1). Stored users are never mutated: every write stores a new copy of the user and is
+    stamped with a commit number, so a reader holding a list of users is never affected by later
+    writes.
+
+    Readers that need a consistent view across several reads pin a commit with ``pin`` and read it
+    with ``users_at``. While a commit is pinned, writers keep the versions they replace so the
+    pinned view can still be rebuilt, and those versions are reclaimed once no pin needs them.
+    Reads take no lock, writers never wait for readers.
+    """
+
+    def __init__(self, users: Optional[list[dict]] = None) -> None:
+        """
+        Constructor for UserRepository class
+
+        :param users: Users to start with
+        """
+        # Current version of every user, and the commit that wrote it, by position
+        self.__users: list[dict] = []
+        self.__written_at: list[int] = []
+        # Commit that inserted every position, ascending
+        self.__inserted_at: list[int] = []
+        # Replaced versions still visible to a pin, by position: (written at, replaced at, user)
+        self.__history: dict[int, list[tuple[int, int, dict]]] = {}
+        self.__positions: dict[int, int] = {}
+        self.__positions_by_email: dict[str, int] = {}
+        self.__last_commit = 0
+        self.__pins: Counter[int] = Counter()
+        self.__statistics = UserStatistics()
+        self.__lock = threading.Lock()
+        self.add_many(users or [])
+
+    @property
+    def users(self) -> list[dict]:
+        """
+        Getter for users
+
+        :return: The current version of every stored user, in insertion order
+        """
+        return self.__users
+
+    @property
+    def statistics(self) -> UserStatistics:
+        """
+        Getter for statistics
+
+        :return: The counters maintained over the stored users
+        """
+        return self.__statistics
+
+    @property
+    def last_commit(self) -> int:
+        """
+        Getter for last_commit
+
+        :return: The commit number of the most recent write
+        """
+        return self.__last_commit
+
+    def __len__(self) -> int:
+        return len(self.__users)
+
+    def add(self, user: dict, on_commit: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        Store a new user
+
+        :param user: The user to store
+        :param on_commit: Called with the stored user before the next write can commit, so events
+            published from it are in commit order
+        :raise DuplicateIdError: If a user with the same id is already stored
+        :raise DuplicateEmailError: If a user with the same email is already stored
+        :return: The stored user
+        """
+        with self.__lock:
+            self.__insert([user])
+            if on_commit is not None:
+                on_commit(user)
+        return user
+
+    def add_many(self, users: Iterable[dict]) -> None:
+        """
+        Store several new users in a single commit
+
+        Either every user is stored or, when one of them would duplicate an id or an email, none is.
+
+        :param users: The users to store
+        :raise DuplicateIdError: If an id is already stored or repeated in the users
+        :raise DuplicateEmailError: If an email is already stored or repeated in the users
+        """
+        users = list(users)
+        with self.__lock:
+            self.__insert(users)
+
+    def update(
+        self,
+        user_id: int,
+        changes: dict,
+        on_commit: Optional[Callable[[dict], None]] = None
+    ) -> tuple[dict | None, frozenset[str]]:
+        """
+        Store a new version of a user with some fields changed
+
+        Only the fields whose value actually changes are written. When any does, the version of the
+        user is bumped and updated_at is set, and only the indexes and counters depending on the
+        changed fields are maintained.
+
+        :param user_id: The id of the user to update
+        :param changes: The fields to set on the user
+        :param on_commit: Called with the new version of the user when a field changed, before the
+            next write can commit, so events published from it are in commit order
+        :raise DuplicateEmailError: If the new email belongs to another user
+        :return: The new version of the user, None if there is no user with that id, and the fields
+            that changed
+        """
+        with self.__lock:
+            position = self.__positions.get(user_id)
+            if position is None:
+                return None, frozenset()
+
+            user = self.__users[position]
+            dirty = {field: value for field, value in changes.items() if user.get(field) != value}
+            if not dirty:
+                return user, frozenset()
+
+            if "email" in dirty:
+                if dirty["email"] in self.__positions_by_email:
+                    raise DuplicateEmailError(dirty["email"])
+                del self.__positions_by_email[user["email"]]
+                self.__positions_by_email[dirty["email"]] = position
+
+            updated_user = {
+                **user,
+                **dirty,
+                "version": user.get("version", 1) + 1,
+                "updated_at": str(datetime.now(tz=timezone.utc))
+            }
+            if not STATISTICS_FIELDS.isdisjoint(dirty):
+                self.__statistics.replace(user, updated_user)
+
+            # Readers load the user before the commit it was written at, so the history entry and
+            # the commit must be in place before the new version is
+            commit = self.__last_commit + 1
+            if self.__pins:
+                self.__history.setdefault(position, []).insert(0, (self.__written_at[position], commit, user))
+            self.__written_at[position] = commit
+            self.__users[position] = updated_user
+            self.__last_commit = commit
+            if on_commit is not None:
+                on_commit(updated_user)
+        return updated_user, frozenset(dirty)
+
+    def get(self, user_id: int) -> dict | None:
+        """
+        Get a user by id
+
+        :param user_id: The id of the user to get
+        :return: The user, None if there is no user with that id
+        """
+        position = self.__positions.get(user_id)
+        return None if position is None else self.__users[position]
+
+    def get_by_email(self, email: str) -> dict | None:
+        """
+        Get a user by email
+
+        :param email: The email of the user to get
+        :return: The user, None if there is no user with that email
+        """
+        position = self.__positions_by_email.get(email)
+        return None if position is None else self.__users[position]
+
+    def get_many(self, user_ids: Iterable[int]) -> tuple[list[dict], list[int]]:
+        """
+        Get several users by id in one pass
+
+        Duplicate ids are resolved once, the order of the first occurrence is kept.
+
+        :param user_ids: The ids of the users to get
+        :return: The users found and the ids that were not, both in request order
+        """
+        found = []
+        missing = []
+        users = self.__users
+        positions = self.__positions
+        for user_id in dict.fromkeys(user_ids):
+            position = positions.get(user_id)
+            if position is None:
+                missing.append(user_id)
+            else:
+                found.append(users[position])
+        return found, missing
+
+    def pin(self, commit: Optional[int] = None) -> int:
+        """
+        Pin a commit, so it can be read with users_at until it is unpinned
+
+        :param commit: A commit that is already pinned, to hold it a little longer, the current
+            commit when omitted
+        :raise SnapshotExpiredError: If the commit is no longer pinned
+        :return: The pinned commit
+        """
+        with self.__lock:
+            if commit is None:
+                commit = self.__last_commit
+            elif not self.__pins[commit]:
+                raise SnapshotExpiredError(commit)
+            self.__pins[commit] += 1
+            return commit
+
+    def unpin(self, commit: int) -> None:
+        """
+        Release a pin, reclaiming the versions no remaining pin can see
+
+        :param commit: A commit returned by pin
+        """
+        with self.__lock:
+            self.__pins[commit] -= 1
+            if self.__pins[commit] <= 0:
+                del self.__pins[commit]
+            self.__reclaim()
+
+    def users_at(self, commit: int) -> list[dict]:
+        """
+        Get every user as it was at a pinned commit, in insertion order
+
+        The commit is pinned for the duration of the read, so it stays readable even if every other
+        pin is released meanwhile.
+
+        :param commit: A commit returned by pin and not unpinned yet
+        :raise SnapshotExpiredError: If the commit is no longer pinned
+        :return: list[dict]
+        """
+        self.pin(commit)
+        try:
+            users = self.__users
+            written_at = self.__written_at
+            visible = []
+            for position in range(bisect_right(self.__inserted_at, commit)):
+                user = users[position]
+                if written_at[position] > commit:
+                    user = self.__version_at(position, commit)
+                visible.append(user)
+            return visible
+        finally:
+            self.unpin(commit)
+
+    def __version_at(self, position: int, commit: int) -> dict:
+        for written_at, replaced_at, user in self.__history.get(position, ()):
+            if written_at <= commit < replaced_at:
+                return user
+        raise SnapshotExpiredError(commit)
+
+    def __reclaim(self) -> None:
+        if not self.__pins:
+            self.__history.clear()
+            return
+        oldest_pin = min(self.__pins)
+        for position, versions in list(self.__history.items()):
+            versions = [version for version in versions if version[1] > oldest_pin]
+            if versions:
+                self.__history[position] = versions
+            else:
+                del self.__history[position]
+
+    def __insert(self, users: list[dict]) -> None:
+        self.__check_unique(users)
+        commit = self.__last_commit + 1
+        for user in users:
+            user.setdefault("version", 1)
+            self.__positions[user["id"]] = len(self.__users)
+            if "email" in user:
+                self.__positions_by_email[user["email"]] = len(self.__users)
+            self.__users.append(user)
+            self.__written_at.append(commit)
+            self.__inserted_at.append(commit)
+            self.__statistics.add(user)
+        self.__last_commit = commit
+
+    def __check_unique(self, users: list[dict]) -> None:
+        user_ids = set()
+        emails = set()
+        for user in users:
+            if user["id"] in self.__positions or user["id"] in user_ids:
+                raise DuplicateIdError(user["id"])
+            user_ids.add(user["id"])
+            email = user.get("email")
+            if email is not None:
+                if email in self.__positions_by_email or email in emails:
+                    raise DuplicateEmailError(email)
+                emails.add(email)
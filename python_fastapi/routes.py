@@ -0,0 +1,394 @@
+from typing import Annotated, Awaitable, Callable, Optional
+
+from fastapi import APIRouter, Body, Header, Path, Query, status, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from python_fastapi.change_feed import stream_server_sent_events
+from python_fastapi.constants import (
+    CHANGE_FEED_BATCH_SIZE,
+    CHANGE_FEED_HEARTBEAT_SECONDS,
+    CHANGE_FEED_MAX_WAIT_SECONDS,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    MERGE_PATCH_MEDIA_TYPE
+)
+from python_fastapi.concurrency import run_cpu_bound
+from python_fastapi.content_negotiation import NegotiatedResponse, NegotiatedRoute
+from python_fastapi.idempotency import idempotency_cache, request_fingerprint
+from python_fastapi.projections import parse_user_fields, serialize_user, serialize_users
+from python_fastapi.schemas import (
+    BatchGetUsersSchema,
+    ResponseSchema,
+    ReadUserSchema,
+    CreateUserSchema,
+    PatchUserSchema,
+    UpdateUserSchema
+)
+from python_fastapi.services import (
+    list_users,
+    open_snapshot,
+    release_snapshot,
+    get_user_by_id,
+    get_user_statistics,
+    get_users_by_ids,
+    create_new_user,
+    update_a_user,
+    patch_a_user,
+    delete_a_user
+)
+from python_fastapi.timing import stage
+from python_fastapi.users_data import user_repository, user_changes, user_snapshots
+
+users_router = APIRouter(
+    prefix="/api/v1/users",
+    tags=["Users"],
+    route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse
+)
+
+metrics_router = APIRouter(
+    prefix="/api/v1/metrics",
+    tags=["Metrics"]
+)
+
+health_router = APIRouter(
+    prefix="/health",
+    tags=["Health"]
+)
+
+Fields = Annotated[Optional[str], Query(
+    description="Comma separated list of fields to return, every field when omitted",
+    examples=["id,username"]
+)]
+
+IdempotencyKey = Annotated[Optional[str], Header(
+    alias="Idempotency-Key",
+    description="Client generated key that makes retries of this write safe",
+    min_length=1,
+    max_length=IDEMPOTENCY_KEY_MAX_LENGTH
+)]
+
+
+async def run_idempotently(
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str],
+    payload: BaseModel,
+    operation: Callable[[], Awaitable[ResponseSchema]]
+) -> ResponseSchema:
+    """
+    Run a write once per Idempotency-Key, replaying the stored response for retries
+
+    :param request: The request being handled
+    :param response: The response, marked with Idempotent-Replayed when served from the cache
+    :param idempotency_key: The key sent by the client, the write always runs when it is missing
+    :param payload: The validated request body
+    :param operation: The write to perform
+    :return: ResponseSchema
+    """
+    if idempotency_key is None:
+        return await operation()
+
+    fingerprint = request_fingerprint(request.method, request.url.path, payload.model_dump_json(exclude_unset=True))
+    result, replayed = await idempotency_cache.execute(idempotency_key, fingerprint, operation)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+@users_router.get(path="", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def get_all_users(
+    request: Request,
+    page: Annotated[int, Query(description="The page number to get", ge=1)] = None,
+    page_size: Annotated[int, Query(description="The number of items to get per page", ge=1)] = None,
+    is_active: Annotated[bool, Query(description="Filter by active status")] = None,
+    is_deleted: Annotated[bool, Query(description="Filter by deleted status")] = None,
+    fields: Fields = None,
+    snapshot: Annotated[Optional[str], Query(
+        description="'new' to read from a snapshot of the users, or the token of a snapshot to keep paging "
+                    "through it. Every page of a snapshot sees the users as they were when it started"
+    )] = None,
+) -> ResponseSchema:
+    """
+    Get all users
+
+    :return: dict
+    """
+    projection = parse_user_fields(fields)
+    extras = {"page": page, "page_size": page_size}
+    commit = None
+    with stage("service"):
+        if snapshot is not None:
+            snapshot, commit = await open_snapshot(snapshot)
+            extras["snapshot"] = snapshot
+            extras["snapshot_expires_in"] = user_snapshots.ttl_seconds
+        response, extras["total_users"] = await list_users(
+            user_repository, page=page, page_size=page_size, is_active=is_active, is_deleted=is_deleted, commit=commit)
+
+    return ResponseSchema(
+        success=True,
+        message="Users retrieved successfully",
+        data=await run_cpu_bound(serialize_users, response, projection, cost=len(response)),
+        extras=extras
+    )
+
+
+@users_router.delete(path="/snapshots/{snapshot}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_snapshot(snapshot: Annotated[str, Path(description="The token of the snapshot to release")]) -> None:
+    """
+    Release a snapshot, letting the versions only it could see be reclaimed
+
+    :param snapshot: the token of the snapshot
+    """
+    with stage("service"):
+        await release_snapshot(snapshot)
+
+    return None
+
+
+@users_router.post(path=":batchGet", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def batch_get_users(batch: BatchGetUsersSchema = Body(), fields: Fields = None) -> ResponseSchema:
+    """
+    Get several users by id in one request
+
+    :param batch: the ids of the users to get
+    :return: dict
+    """
+    projection = parse_user_fields(fields)
+    with stage("service"):
+        found_users, missing_ids = await get_users_by_ids(batch.ids, user_repository)
+
+    return ResponseSchema(
+        success=True,
+        message="Users retrieved successfully",
+        data={
+            "users": await run_cpu_bound(serialize_users, found_users, projection, cost=len(found_users)),
+            "missing_ids": missing_ids
+        },
+        extras={
+            "found": len(found_users),
+            "missing": len(missing_ids)
+        }
+    )
+
+
+@users_router.get(path="/stats", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def get_users_stats() -> ResponseSchema:
+    """
+    Get the number of users per status and per day of creation
+
+    :return: dict
+    """
+    with stage("service"):
+        statistics = await get_user_statistics(user_repository)
+
+    return ResponseSchema(
+        success=True,
+        message="User statistics retrieved successfully",
+        data=statistics
+    )
+
+
+@users_router.get(path="/changes", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def get_user_changes(
+    request: Request,
+    since: Annotated[Optional[int], Query(description="The last sequence number already seen", ge=0)] = None,
+    wait: Annotated[float, Query(
+        description="Seconds to wait for new changes when there are none (long-polling)",
+        ge=0,
+        le=CHANGE_FEED_MAX_WAIT_SECONDS
+    )] = 0,
+    limit: Annotated[int, Query(
+        description="The maximum number of changes to return",
+        ge=1,
+        le=CHANGE_FEED_BATCH_SIZE
+    )] = CHANGE_FEED_BATCH_SIZE,
+    last_event_id: Annotated[Optional[int], Header(description="Sequence number to resume a stream from")] = None,
+) -> ResponseSchema | StreamingResponse:
+    """
+    Get the changes made to users after a sequence number
+
+    Streams Server-Sent Events when the client accepts text/event-stream, otherwise returns a page of
+    changes, optionally waiting for new ones. Clients that fell behind the feed are told to resync.
+
+    :return: dict
+    """
+    since = since if since is not None else last_event_id or 0
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_server_sent_events(user_changes, since, limit, CHANGE_FEED_HEARTBEAT_SECONDS),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    changes, resync = user_changes.read(since, limit)
+    if not changes and not resync and wait and await user_changes.wait(since, wait):
+        changes, resync = user_changes.read(since, limit)
+
+    next_since = since
+    if resync:
+        next_since = user_changes.last_sequence
+    elif changes:
+        next_since = changes[-1]["sequence"]
+
+    return ResponseSchema(
+        success=True,
+        message="Change feed position expired, resync required" if resync else "Changes retrieved successfully",
+        data=changes,
+        extras={
+            "resync": resync,
+            "next_since": next_since,
+            "last_sequence": user_changes.last_sequence
+        }
+    )
+
+
+@users_router.get(path="/{user_id}", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def get_user(
+    user_id: Annotated[int, Path(description="The id of the user to get")],
+    fields: Fields = None
+) -> ResponseSchema:
+    """
+    Get user by id
+
+    :param user_id: int
+    :return: dict
+    """
+    projection = parse_user_fields(fields)
+    with stage("service"):
+        user = await get_user_by_id(user_id, user_repository)
+    return ResponseSchema(
+            success=True,
+            message="Users retrieved successfully",
+            data=serialize_user(user, projection)
+        )
+
+
+@users_router.post(path="", status_code=status.HTTP_201_CREATED, response_model=ResponseSchema)
+async def create_user(
+    request: Request,
+    response: Response,
+    idempotency_key: IdempotencyKey = None,
+    user: CreateUserSchema = Body()
+) -> ResponseSchema:
+    """
+    Create a new user
+
+    :param user: dictionary containing user data
+    :return: dict
+    """
+    async def create() -> ResponseSchema:
+        with stage("service"):
+            new_user = await create_new_user(user, user_repository)
+
+        return ResponseSchema(
+                success=True,
+                message="User created successfully",
+                data=ReadUserSchema(**new_user.to_dict()).model_dump()
+        )
+
+    return await run_idempotently(request, response, idempotency_key, user, create)
+
+
+@users_router.put(path="/{user_id}", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def replace_user(
+    request: Request,
+    response: Response,
+    idempotency_key: IdempotencyKey = None,
+    user_id: int = Path(),
+    user_update_data: UpdateUserSchema = Body()
+) -> ResponseSchema:
+    """
+    Replace the updatable fields of a user by id
+
+    :param user_id: the id of the user to update
+    :param user_update_data: the new data to update the user with
+    :return: dict
+    """
+    async def replace() -> ResponseSchema:
+        with stage("service"):
+            updated_user = await update_a_user(user_id, user_update_data, user_repository)
+
+        return ResponseSchema(
+                success=True,
+                message="User updated successfully",
+                data=ReadUserSchema(**updated_user).model_dump()
+        )
+
+    return await run_idempotently(request, response, idempotency_key, user_update_data, replace)
+
+
+@users_router.patch(path="/{user_id}", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def patch_user(
+    request: Request,
+    response: Response,
+    idempotency_key: IdempotencyKey = None,
+    user_id: int = Path(),
+    user_patch: PatchUserSchema = Body(media_type=MERGE_PATCH_MEDIA_TYPE)
+) -> ResponseSchema:
+    """
+    Partially update a user by id with a JSON Merge Patch
+
+    :param user_id: the id of the user to update
+    :param user_patch: the merge patch, only the fields it contains are changed
+    :return: dict
+    """
+    async def patch() -> ResponseSchema:
+        with stage("service"):
+            patched_user = await patch_a_user(user_id, user_patch, user_repository)
+
+        return ResponseSchema(
+                success=True,
+                message="User updated successfully",
+                data=ReadUserSchema(**patched_user).model_dump()
+        )
+
+    response.headers["Accept-Patch"] = MERGE_PATCH_MEDIA_TYPE
+    return await run_idempotently(request, response, idempotency_key, user_patch, patch)
+
+
+@users_router.delete(path="/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(user_id: int = Path()) -> None:
+    """
+    Delete user by id
+
+    :param user_id: the id of the user to delete
+    :return: dict
+    """
+    with stage("service"):
+        await delete_a_user(user_id, user_repository)
+
+    return None
+
+
+@metrics_router.get(path="/server-timing", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def get_server_timing_histograms(request: Request) -> ResponseSchema:
+    """
+    Get the per-stage histograms of the Server-Timing durations
+
+    :return: dict
+    """
+    return ResponseSchema(
+        success=True,
+        message="Server timing histograms retrieved successfully",
+        data=request.app.state.stage_histograms.to_dict()
+    )
+
+
+@health_router.get(path="/ready", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
+async def get_readiness(request: Request, response: Response) -> ResponseSchema:
+    """
+    Tell load balancers whether to send traffic, ready only once warmed up and until shutdown starts
+
+    :return: dict
+    """
+    ready = request.app.state.ready
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ResponseSchema(
+        success=ready,
+        message="Ready to serve requests" if ready else "Not ready to serve requests",
+        data={"ready": ready}
+    )
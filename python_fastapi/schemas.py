@@ -1,15 +1,15 @@
 from typing import Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from python_fastapi.constants import VALID_EMAIL_DOMAIN, GenderEnum
+from python_fastapi.constants import BATCH_GET_MAX_IDS, VALID_EMAIL_DOMAIN, GenderEnum
 from python_fastapi.utils import validate_password
 
 
 class BaseReadSchema(BaseModel):
     id: int
     created_at: str
-    updated_at: str
+    updated_at: Optional[str] = None
 
 class BaseUserSchema(BaseModel):
     username: str
@@ -45,12 +45,46 @@ class CreateUserSchema(BaseUserSchema):
 
 class ReadUserSchema(BaseReadSchema, BaseUserSchema):
     is_active: bool
+    version: int = 1
 
 
 class UpdateUserSchema(BaseUserSchema):
     pass
 
 
+class PatchUserSchema(BaseModel):
+    """
+    JSON Merge Patch (RFC 7396) of a user, only the members present in the document are changed
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    username: Optional[str] = None
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    @field_validator("username", "email", "is_active", mode="before")
+    @classmethod
+    def reject_null(cls, value):
+        # In a merge patch null removes a member, and none of these members can be removed
+        if value is None:
+            raise ValueError("Field cannot be removed")
+        return value
+
+    @field_validator("username")
+    @classmethod
+    def validate_username(cls, value: str) -> str:
+        return BaseUserSchema.validate_username(value)
+
+    @field_validator("email")
+    @classmethod
+    def validate_email_domain(cls, email: str) -> str:
+        return CreateUserSchema.validate_email_domain(email)
+
+
+class BatchGetUsersSchema(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=BATCH_GET_MAX_IDS)
+
+
 class ResponseSchema(BaseModel):
     success: bool
     message: str
@@ -0,0 +1,229 @@
+"""
+Synthetic user generator for seeding stores and writing load-test fixtures
+
+Usage, from the repository root::
+
+    python -m python_fastapi.seed --count 1000000 --seed 42 --now 2025-01-01T00:00:00+00:00 --ndjson users.ndjson
+
+Passing the same ``--seed`` and ``--now`` produces identical files.
+"""
+import argparse
+import csv
+import random
+import string
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate, chain, islice
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+import orjson
+
+from python_fastapi.constants import VALID_EMAIL_DOMAIN
+from python_fastapi.repositories import UserRepository
+
+SEED_START_ID = 1_000_001
+
+SEED_BATCH_SIZE = 10_000
+
+SEED_CHUNK_SIZE = 1_000
+
+USER_COLUMNS = ("id", "email", "username", "password", "created_at", "updated_at", "deleted_at", "is_active")
+
+FIRST_NAMES = (
+    "kwame", "kofi", "kojo", "kwaku", "yaw", "kwabena", "kwesi", "akosua", "adwoa", "abena", "akua", "yaa",
+    "afua", "ama", "esi", "efua", "nana", "ekow", "fiifi", "mawuli", "selasi", "edem", "dzifa", "elikem",
+    "richard", "grace", "emmanuel", "mercy", "samuel", "joyce", "daniel", "priscilla", "isaac", "gifty"
+)
+
+LAST_NAMES = (
+    "mensah", "owusu", "boateng", "asante", "osei", "agyeman", "addo", "amoah", "appiah", "darko", "ofori",
+    "antwi", "badu", "quaye", "tetteh", "adjei", "nkrumah", "danquah", "gyamfi", "sarpong", "frimpong",
+    "agbeko", "kpodo", "amedzro", "yeboah", "ansah", "acheampong", "ampofo", "bonsu", "kyei"
+)
+
+# (share of all users, share of the group ever updated, share of the group deleted), deleted users
+# are a subset of the updated ones
+ACTIVE_MIX = (0.7, 0.4, 0.02)
+
+INACTIVE_MIX = (0.3, 0.35, 0.25)
+
+HISTORY_DAYS = 3 * 365
+
+
+def _password_pool(rng: random.Random, size: int = 4096) -> list[str]:
+    # Every password has at least one letter and one digit and is at least 8 characters long
+    alphabet = string.ascii_letters + string.digits
+    return [
+        rng.choice(string.ascii_letters) + rng.choice(string.digits) + "".join(rng.choices(alphabet, k=rng.randint(6, 14)))
+        for _ in range(size)
+    ]
+
+
+def _timestamp_formatter(epoch: datetime) -> Callable[[int], str]:
+    # str(datetime) of a UTC timestamp, assembled from cached day and time-of-day strings
+    day_prefixes = [str((epoch + timedelta(days=day)).date()) for day in range(HISTORY_DAYS + 2)]
+    times_of_day = [
+        f"{hours:02d}:{minutes:02d}:{seconds:02d}" for hours in range(24) for minutes in range(60) for seconds in range(60)
+    ]
+
+    def format_timestamp(offset_microseconds: int) -> str:
+        seconds, microseconds = divmod(offset_microseconds, 1_000_000)
+        days, seconds = divmod(seconds, 86_400)
+        return f"{day_prefixes[days]} {times_of_day[seconds]}.{microseconds:06d}+00:00"
+
+    return format_timestamp
+
+
+def generate_users(
+    count: int,
+    seed: int = 0,
+    start_id: int = SEED_START_ID,
+    batch_size: int = SEED_BATCH_SIZE,
+    now: Optional[datetime] = None
+) -> Iterator[list[dict]]:
+    """
+    Generate users that pass CreateUserSchema, in batches
+
+    Ids and emails are unique, emails use the valid domain and passwords follow the password rules.
+    Users are spread over the last three years, with a mix of active, inactive, updated and deleted
+    users. The same seed and ``now`` always produce the same users, whatever the batch size: users are
+    drawn in fixed chunks of ``SEED_CHUNK_SIZE``, each from a generator derived from the seed and the
+    position of the chunk, and only regrouped into batches afterwards.
+
+    :param count: The number of users to generate
+    :param seed: The seed of the random generator
+    :param start_id: The id of the first user, well above the ids generate_id hands out
+    :param batch_size: The number of users per batch
+    :param now: The end of the creation window, the current time if omitted
+    :return: An iterator of batches of users
+    """
+    passwords = _password_pool(random.Random(seed))
+    names = [f"{first_name}.{last_name}" for first_name in FIRST_NAMES for last_name in LAST_NAMES]
+    now = now or datetime.now(tz=timezone.utc)
+    epoch = (now - timedelta(days=HISTORY_DAYS)).replace(hour=0, minute=0, second=0, microsecond=0)
+    window = int((now - epoch).total_seconds() * 1_000_000)
+    format_timestamp = _timestamp_formatter(epoch)
+    active_weights = list(accumulate((ACTIVE_MIX[0], INACTIVE_MIX[0])))
+    _, active_updated, active_deleted = ACTIVE_MIX
+    _, inactive_updated, inactive_deleted = INACTIVE_MIX
+
+    def generate_chunk(chunk_start: int) -> list[dict]:
+        # Every column of a chunk is drawn at once, then the rows are zipped together
+        rng = random.Random(f"{seed}/{chunk_start}")
+        size = min(SEED_CHUNK_SIZE, count - chunk_start)
+        ids = range(start_id + chunk_start, start_id + chunk_start + size)
+        chunk_names = rng.choices(names, k=size)
+        chunk_passwords = rng.choices(passwords, k=size)
+        actives = rng.choices((True, False), cum_weights=active_weights, k=size)
+        created = [int(rng.random() * window) for _ in range(size)]
+        rolls = [rng.random() for _ in range(size)]
+        updated = [
+            format_timestamp(created_at + int(rng.random() * (window - created_at)))
+            if roll < (active_updated if is_active else inactive_updated) else None
+            for created_at, roll, is_active in zip(created, rolls, actives)
+        ]
+        deleted = [
+            updated_at if roll < (active_deleted if is_active else inactive_deleted) else None
+            for updated_at, roll, is_active in zip(updated, rolls, actives)
+        ]
+
+        return [
+            {
+                "id": user_id,
+                "email": f"{name}.{user_id}@{VALID_EMAIL_DOMAIN}",
+                "username": f"{name}{user_id}",
+                "password": password,
+                "created_at": created_at,
+                "updated_at": updated_at,
+                "deleted_at": deleted_at,
+                "is_active": is_active
+            }
+            for user_id, name, password, created_at, updated_at, deleted_at, is_active in zip(
+                ids, chunk_names, chunk_passwords, map(format_timestamp, created), updated, deleted, actives
+            )
+        ]
+
+    users = chain.from_iterable(map(generate_chunk, range(0, count, SEED_CHUNK_SIZE)))
+    for batch_start in range(0, count, batch_size):
+        yield list(islice(users, batch_size))
+
+
+def load_users(repository: UserRepository, batches: Iterable[list[dict]]) -> int:
+    """
+    Load generated users straight into a repository, bypassing request validation
+
+    :param repository: The repository to load the users into
+    :param batches: Batches of users, as produced by generate_users
+    :return: The number of users loaded
+    """
+    loaded = 0
+    for batch in batches:
+        repository.add_many(batch)
+        loaded += len(batch)
+    return loaded
+
+
+def write_ndjson(batches: Iterable[list[dict]], file: TextIO) -> int:
+    """
+    Write users as newline delimited JSON, one user per line
+
+    :param batches: Batches of users, as produced by generate_users
+    :param file: The text file to write to
+    :return: The number of users written
+    """
+    written = 0
+    for batch in batches:
+        file.write(b"\n".join(orjson.dumps(user) for user in batch).decode())
+        file.write("\n")
+        written += len(batch)
+    return written
+
+
+def write_csv(batches: Iterable[list[dict]], file: TextIO) -> int:
+    """
+    Write users as CSV with a header row, empty cells for missing timestamps
+
+    :param batches: Batches of users, as produced by generate_users
+    :param file: The text file to write to, opened with ``newline=""``
+    :return: The number of users written
+    """
+    writer = csv.writer(file)
+    writer.writerow(USER_COLUMNS)
+    written = 0
+    for batch in batches:
+        writer.writerows([user[column] for column in USER_COLUMNS] for user in batch)
+        written += len(batch)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="The number of users to generate")
+    parser.add_argument("--seed", type=int, default=0, help="The seed of the random generator")
+    parser.add_argument("--start-id", type=int, default=SEED_START_ID, help="The id of the first user")
+    parser.add_argument(
+        "--now", type=datetime.fromisoformat, help="End of the creation window, ISO 8601, the current time if omitted"
+    )
+    parser.add_argument("--ndjson", help="Write the users to this NDJSON file")
+    parser.add_argument("--csv", help="Write the users to this CSV file")
+    args = parser.parse_args()
+
+    writers = []
+    if args.ndjson:
+        writers.append((write_ndjson, args.ndjson))
+    if args.csv:
+        writers.append((write_csv, args.csv))
+    if not writers:
+        parser.error("at least one of --ndjson or --csv is required")
+
+    now = args.now or datetime.now(tz=timezone.utc)
+    for writer, path in writers:
+        started_at = time.perf_counter()
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            written = writer(generate_users(args.count, args.seed, args.start_id, now=now), file)
+        elapsed = time.perf_counter() - started_at
+        print(f"{path}: {written} users in {elapsed:.2f}s ({written / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
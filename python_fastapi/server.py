@@ -0,0 +1,192 @@
+"""
+Production launcher for the application
+
+Usage, from the repository root::
+
+    python -m python_fastapi serve [--host 0.0.0.0] [--port 8000] [--workers 4]
+
+Every option defaults to the matching ``PYTHON_FASTAPI_*`` setting. One worker process is started
+per available core unless ``--workers`` says otherwise. With SO_REUSEPORT every worker binds its own
+listening socket and the kernel spreads connections across them, otherwise the workers share one
+socket. uvloop and httptools are used when installed. On SIGTERM or SIGINT the workers stop
+accepting connections, report not ready and finish the requests in flight, for up to
+``graceful_shutdown_seconds``.
+"""
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import signal
+import socket
+from multiprocessing.connection import wait
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+from python_fastapi.settings import Settings, get_settings
+
+
+def available_cores() -> int:
+    """
+    Count the cores this process may run on, honouring CPU affinity where the platform exposes it
+
+    :return: int
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def event_loop() -> str:
+    """
+    Pick the fastest event loop installed
+
+    :return: The uvicorn loop setting
+    """
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    """
+    Pick the fastest HTTP parser installed
+
+    :return: The uvicorn http setting
+    """
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def bind_socket(host: str, port: int, backlog: int, reuse_port: bool) -> socket.socket:
+    """
+    Open a listening TCP socket
+
+    :param host: The address to bind to
+    :param port: The port to bind to
+    :param backlog: The maximum number of connections waiting to be accepted
+    :param reuse_port: Whether to set SO_REUSEPORT, so several workers can bind the same port
+    :return: socket.socket
+    """
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    uvicorn server that marks the application not ready as soon as shutdown starts
+
+    Load balancers probing the readiness endpoint over kept-alive connections stop sending new
+    requests while the ones in flight are drained.
+    """
+
+    def __init__(self, config: uvicorn.Config, app: FastAPI) -> None:
+        """
+        Constructor for DrainingServer class
+
+        :param config: The uvicorn configuration
+        :param app: The application served, whose readiness is withdrawn on shutdown
+        """
+        super().__init__(config)
+        self.__app = app
+
+    def handle_exit(self, sig: int, frame) -> None:
+        self.__app.state.ready = False
+        super().handle_exit(sig, frame)
+
+
+def run_worker(settings: Settings, sock: Optional[socket.socket] = None) -> None:
+    """
+    Build the application and serve it until shutdown, in the current process
+
+    :param settings: The settings to create the application and the server with
+    :param sock: A listening socket shared by every worker, a new one is bound when omitted
+    """
+    from python_fastapi.app import create_app
+
+    app = create_app(settings)
+    sock = sock or bind_socket(settings.host, settings.port, settings.backlog, settings.reuse_port)
+    config = uvicorn.Config(
+        app,
+        loop=event_loop(),
+        http=http_protocol(),
+        lifespan="on",
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.keep_alive_seconds,
+        timeout_graceful_shutdown=settings.graceful_shutdown_seconds
+    )
+    DrainingServer(config, app).run(sockets=[sock])
+
+
+def serve(settings: Settings) -> None:
+    """
+    Serve the application with one worker process per core, restarting workers that die
+
+    :param settings: The settings to create the application and the server with
+    """
+    workers = settings.workers or available_cores()
+    if workers == 1:
+        run_worker(settings)
+        return
+
+    shared_socket = None if settings.reuse_port else bind_socket(
+        settings.host, settings.port, settings.backlog, reuse_port=False)
+    context = multiprocessing.get_context("spawn")
+    stopping = False
+
+    def start_worker() -> multiprocessing.Process:
+        process = context.Process(target=run_worker, args=(settings, shared_socket))
+        process.start()
+        return process
+
+    def stop(sig: int, frame) -> None:
+        # Workers drain on SIGTERM, a second SIGINT would make uvicorn exit without draining
+        nonlocal stopping
+        stopping = True
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    processes = [start_worker() for _ in range(workers)]
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while True:
+        alive = [process.sentinel for process in processes if process.is_alive()]
+        if stopping and not alive:
+            break
+        wait(alive, timeout=1)
+        if not stopping:
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    processes[index] = start_worker()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m python_fastapi", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Serve the application")
+    serve_parser.add_argument("--host", help="The address to bind to")
+    serve_parser.add_argument("--port", type=int, help="The port to bind to")
+    serve_parser.add_argument("--workers", type=int, help="The number of worker processes, one per core by default")
+    serve_parser.add_argument("--backlog", type=int, help="The maximum number of connections waiting to be accepted")
+    serve_parser.add_argument(
+        "--keep-alive", dest="keep_alive_seconds", type=int, help="Seconds an idle connection is kept open"
+    )
+    serve_parser.add_argument(
+        "--graceful-timeout", dest="graceful_shutdown_seconds", type=int,
+        help="Seconds given to requests in flight to finish on shutdown"
+    )
+    serve_parser.add_argument(
+        "--reuse-port", action=argparse.BooleanOptionalAction, default=None,
+        help="Give every worker its own socket with SO_REUSEPORT"
+    )
+    args = vars(parser.parse_args(argv))
+    args.pop("command")
+
+    serve(get_settings().model_copy(update={name: value for name, value in args.items() if value is not None}))
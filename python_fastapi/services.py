@@ -1,10 +1,15 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
 from fastapi import HTTPException, status
 
-from python_fastapi.helper_functions import get_user_from_list, check_email_uniqueness
+from python_fastapi.change_feed import ChangeFeed
+from python_fastapi.concurrency import run_cpu_bound
+from python_fastapi.constants import NEW_SNAPSHOT
 from python_fastapi.models import User
-from python_fastapi.schemas import CreateUserSchema, UpdateUserSchema
+from python_fastapi.repositories import DuplicateEmailError, DuplicateIdError, SnapshotExpiredError, UserRepository
+from python_fastapi.schemas import CreateUserSchema, PatchUserSchema, ReadUserSchema, UpdateUserSchema
+from python_fastapi.snapshots import SnapshotLeases
+from python_fastapi.users_data import user_changes, user_snapshots
 
 
 def offset_calculator(page: int, page_size: int) -> int:
@@ -29,7 +34,6 @@ def get_all_users_from_list(
     :return: A filtered and optionally paginated list of users
     """
     def user_matches(user: dict) -> bool:
-        # TODO: fix is_deleted bug
         if is_active is not None and user["is_active"] != is_active:
             return False
         if is_deleted is True and user["deleted_at"] is None:
@@ -47,64 +51,238 @@ def get_all_users_from_list(
     return filtered_users
 
 
-def get_user_by_id(user_id: int, users_list: list[dict]) -> dict | None:
+async def list_users(
+        repository: UserRepository,
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = None,
+        commit: Optional[int] = None
+) -> tuple[list[dict], int]:
+    """
+    Get a page of users and the number of users matching the filters
+
+    Filtering goes through every user, so it is moved off the event loop for large repositories.
+
+    :param repository: The repository to get the users from
+    :param page: The page number to get
+    :param page_size: The number of items to get per page
+    :param is_active: The active status to filter by
+    :param is_deleted: The deleted status to filter by
+    :param commit: A pinned commit to read the users at, the latest users when omitted
+    :return: The users of the page and the number of matching users
     """
-    Get user from list of users
+    def collect() -> tuple[list[dict], int]:
+        if commit is None:
+            page_users = get_all_users_from_list(repository.users, page, page_size, is_active, is_deleted)
+            return page_users, repository.statistics.count(is_active=is_active, is_deleted=is_deleted)
+
+        # The statistics only describe the latest users, so the total is counted at the commit
+        try:
+            users = repository.users_at(commit)
+        except SnapshotExpiredError:
+            raise snapshot_expired()
+        matching_users = get_all_users_from_list(users=users, is_active=is_active, is_deleted=is_deleted)
+        return get_all_users_from_list(users=matching_users, page=page, page_size=page_size), len(matching_users)
+
+    return await run_cpu_bound(collect, cost=len(repository))
+
+
+async def open_snapshot(snapshot: str, snapshots: SnapshotLeases = user_snapshots) -> tuple[str, int]:
+    """
+    Start a snapshot, or continue reading one started by an earlier request
+
+    :param snapshot: "new" to pin the current state of the users, or a token returned earlier
+    :param snapshots: The leases of the snapshots
+    :return: The token of the snapshot and the commit it reads
+    """
+    if snapshot == NEW_SNAPSHOT:
+        return snapshots.acquire()
+
+    commit = snapshots.renew(snapshot)
+    if commit is None:
+        raise snapshot_expired()
+    return snapshot, commit
+
+
+def snapshot_expired() -> HTTPException:
+    """
+    Build the error returned when reading a snapshot that expired or never existed
+
+    :return: HTTPException
+    """
+    return HTTPException(
+        status_code=status.HTTP_410_GONE,
+        detail="Snapshot expired or unknown, restart from the first page."
+    )
+
+
+async def release_snapshot(snapshot: str, snapshots: SnapshotLeases = user_snapshots) -> None:
+    """
+    Release a snapshot before it expires
+
+    :param snapshot: The token of the snapshot
+    :param snapshots: The leases of the snapshots
+    """
+    if not snapshots.release(snapshot):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found.")
+
+
+async def get_user_by_id(user_id: int, repository: UserRepository) -> dict | None:
+    """
+    Get user from the repository
 
     :param user_id: the id of the user to get
-    :param users_list: the list of users to search from
+    :param repository: the repository to search from
     :return: dict
     """
-    user = get_user_from_list(user_id, users_list)
+    user = repository.get(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
     return user
 
 
-def create_new_user(
+async def get_user_statistics(repository: UserRepository) -> dict:
+    """
+    Get the statistics maintained over the users
+
+    :param repository: the repository to get the statistics of
+    :return: dict
+    """
+    return repository.statistics.to_dict()
+
+
+async def get_users_by_ids(user_ids: list[int], repository: UserRepository) -> tuple[list[dict], list[int]]:
+    """
+    Get several users by id
+
+    :param user_ids: the ids of the users to get
+    :param repository: the repository to search from
+    :return: The users found and the ids that were not, both in request order
+    """
+    return repository.get_many(user_ids)
+
+
+def change_publisher(change_feed: ChangeFeed, operation: str) -> Callable[[dict], None]:
+    """
+    Build the hook publishing a write to the change feed from inside the repository commit
+
+    Publishing while the write still holds the repository lock gives events the same order as the
+    commits, so consumers applying them in sequence order never go back to an older version.
+
+    :param change_feed: The feed to publish to
+    :param operation: The kind of write, one of create, update or delete
+    :return: A function taking the stored user
+    """
+    def publish(user: dict) -> None:
+        change_feed.publish(operation, user["id"], ReadUserSchema(**user).model_dump())
+
+    return publish
+
+
+async def create_new_user(
     user: CreateUserSchema,
-    users_list: list[dict]
+    repository: UserRepository,
+    change_feed: ChangeFeed = user_changes
 ) -> User:
     """
     Create a new user
 
     :param user: The user to create
-    :param users_list: The list of users to add the new user to
+    :param repository: The repository to add the new user to
+    :param change_feed: The feed to publish the creation to
     :return: The created user
     """
-    if not check_email_uniqueness(user.model_dump()["email"], users_list):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists.")
-
-    user = User(**user.model_dump())
+    while True:
+        new_user = User(**user.model_dump())
+        try:
+            repository.add(new_user.to_dict(), on_commit=change_publisher(change_feed, "create"))
+            break
+        except DuplicateIdError:
+            # Ids are drawn at random, draw again until one is free
+            continue
+        except DuplicateEmailError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists.")
 
-    User.save(user.to_dict(), users_list)
+    return new_user
 
-    return user
 
-
-def update_a_user(
+async def update_a_user(
     user_id: int,
     user_update_data: UpdateUserSchema,
-    users_list: list[dict]
-) -> User:
+    repository: UserRepository,
+    change_feed: ChangeFeed = user_changes
+) -> dict:
     """
-    Update a user
+    Replace the updatable fields of a user
 
     :param user_id: The id of the user to update
     :param user_update_data: The data to update the user with
-    :param users_list: The list of users to update the user in
+    :param repository: The repository to update the user in
+    :param change_feed: The feed to publish the update to
     :return: The updated user
     """
-    user = get_user_from_list(user_id, users_list)
-    if not user:
+    return await apply_user_changes(user_id, user_update_data.model_dump(), repository, change_feed)
+
+
+async def patch_a_user(
+    user_id: int,
+    user_patch: PatchUserSchema,
+    repository: UserRepository,
+    change_feed: ChangeFeed = user_changes
+) -> dict:
+    """
+    Apply a JSON Merge Patch to a user, leaving the fields missing from the patch untouched
+
+    :param user_id: The id of the user to patch
+    :param user_patch: The merge patch to apply
+    :param repository: The repository to update the user in
+    :param change_feed: The feed to publish the update to
+    :return: The patched user
+    """
+    return await apply_user_changes(user_id, user_patch.model_dump(exclude_unset=True), repository, change_feed)
+
+
+async def apply_user_changes(
+    user_id: int,
+    changes: dict,
+    repository: UserRepository,
+    change_feed: ChangeFeed = user_changes
+) -> dict:
+    """
+    Store a new version of a user with changes applied, publishing an update only if a field actually changed
+
+    :param user_id: The id of the user to update
+    :param changes: The fields to set on the user
+    :param repository: The repository to update the user in
+    :param change_feed: The feed to publish the update to
+    :return: The updated user
+    """
+    try:
+        user, _ = repository.update(user_id, changes, on_commit=change_publisher(change_feed, "update"))
+    except DuplicateEmailError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists.")
+
+    if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
-    user_obj = User.create_instance(**user)
+    return user
 
-    for key, value in user_update_data.model_dump().items():
-        if hasattr(user_obj, key):
-            setattr(user_obj, key, value)
 
-    user_obj.updated_at = str(datetime.now(tz=timezone.utc))
+async def delete_a_user(
+    user_id: int,
+    repository: UserRepository,
+    change_feed: ChangeFeed = user_changes
+) -> None:
+    """
+    Soft delete a user
+
+    :param user_id: The id of the user to delete
+    :param repository: The repository to delete the user from
+    :param change_feed: The feed to publish the deletion to
+    """
+    user_to_delete, _ = repository.update(
+        user_id, {"deleted_at": str(datetime.now(tz=timezone.utc))}, on_commit=change_publisher(change_feed, "delete"))
+    if not user_to_delete:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
-    return user_obj
@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Runtime settings for the application, read from ``PYTHON_FASTAPI_*`` environment variables
+    """
+    model_config = SettingsConfigDict(env_prefix="PYTHON_FASTAPI_")
+
+    title: str = "Python FastAPI"
+    version: str = "0.1.0"
+    prebuild_openapi: bool = True
+    warm_validators: bool = True
+    server_timing: bool = True
+    server_timing_histograms: bool = False
+    seed_users: int = 0
+    seed: int = 0
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: Optional[int] = None
+    backlog: int = 2048
+    keep_alive_seconds: int = 5
+    graceful_shutdown_seconds: int = 30
+    reuse_port: bool = True
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Get the settings for the application
+
+    :return: Settings
+    """
+    return Settings()
@@ -0,0 +1,102 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from python_fastapi.repositories import UserRepository
+
+
+class SnapshotLeases:
+    """
+    Time limited leases on pinned commits of a repository, handed to clients as opaque tokens
+
+    A client paging through users starts a snapshot and passes its token with every following page,
+    so every page is read from the same commit however many writes happen in between. Each use of a
+    token extends its lease. Leases that are not renewed within the TTL, or that are pushed out by
+    newer ones beyond the size cap, are released so the repository can reclaim the versions they kept.
+    """
+
+    def __init__(self, repository: UserRepository, ttl_seconds: float, max_leases: int) -> None:
+        """
+        Constructor for SnapshotLeases class
+
+        :param repository: The repository whose commits are pinned
+        :param ttl_seconds: How long a lease lives without being used
+        :param max_leases: The maximum number of leases held, least recently used are released first
+        """
+        self.__repository = repository
+        self.__ttl_seconds = ttl_seconds
+        self.__max_leases = max_leases
+        # token -> (pinned commit, expires at), least recently used first
+        self.__leases: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @property
+    def ttl_seconds(self) -> float:
+        """
+        Getter for ttl_seconds
+
+        :return: How long a lease lives without being used
+        """
+        return self.__ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self.__leases)
+
+    def acquire(self) -> tuple[str, int]:
+        """
+        Pin the current commit of the repository under a new token
+
+        :return: The token and the pinned commit
+        """
+        token = secrets.token_urlsafe(16)
+        commit = self.__repository.pin()
+        with self.__lock:
+            self.__leases[token] = (commit, time.monotonic() + self.__ttl_seconds)
+            self.__release_expired()
+            while len(self.__leases) > self.__max_leases:
+                self.__release_oldest()
+        return token, commit
+
+    def renew(self, token: str) -> int | None:
+        """
+        Extend the lease of a token
+
+        :param token: A token returned by acquire
+        :return: The commit pinned by the token, None if it is unknown or expired
+        """
+        with self.__lock:
+            self.__release_expired()
+            lease = self.__leases.get(token)
+            if lease is None:
+                return None
+            self.__leases[token] = (lease[0], time.monotonic() + self.__ttl_seconds)
+            self.__leases.move_to_end(token)
+            return lease[0]
+
+    def release(self, token: str) -> bool:
+        """
+        Release a lease before it expires
+
+        :param token: A token returned by acquire
+        :return: Whether the token was leased
+        """
+        with self.__lock:
+            lease = self.__leases.pop(token, None)
+        if lease is None:
+            return False
+        self.__repository.unpin(lease[0])
+        return True
+
+    def __release_expired(self) -> None:
+        # Every use moves a lease to the end with a full TTL, so the first to expire are at the front
+        now = time.monotonic()
+        while self.__leases:
+            _, expires_at = next(iter(self.__leases.values()))
+            if expires_at > now:
+                break
+            self.__release_oldest()
+
+    def __release_oldest(self) -> None:
+        _, (commit, _) = self.__leases.popitem(last=False)
+        self.__repository.unpin(commit)
@@ -0,0 +1,110 @@
+import threading
+from collections import Counter
+from typing import Optional
+
+
+class UserStatistics:
+    """
+    Counters over the stored users, kept up to date on every write
+
+    Users are counted per (is_active, is_deleted) cell, so the total for any combination of the list
+    filters is the sum of at most four counters, and per day of creation. The counters have their
+    own lock, so they can be read while writers are updating them.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for UserStatistics class
+        """
+        self.__cells: Counter[tuple[bool, bool]] = Counter()
+        self.__created_per_day: Counter[str] = Counter()
+        self.__lock = threading.Lock()
+
+    def add(self, user: dict) -> None:
+        """
+        Count a user
+
+        :param user: The stored user
+        """
+        with self.__lock:
+            self.__add(user)
+
+    def remove(self, user: dict) -> None:
+        """
+        Stop counting a user
+
+        :param user: The stored user
+        """
+        with self.__lock:
+            self.__remove(user)
+
+    def replace(self, user: dict, updated_user: dict) -> None:
+        """
+        Count the new version of an updated user instead of the previous one, in a single step
+
+        :param user: The stored user before the update
+        :param updated_user: The stored user after the update
+        """
+        with self.__lock:
+            self.__remove(user)
+            self.__add(updated_user)
+
+    def count(self, is_active: Optional[bool] = None, is_deleted: Optional[bool] = None) -> int:
+        """
+        Count the users matching the list filters
+
+        :param is_active: The active status to filter by
+        :param is_deleted: The deleted status to filter by
+        :return: int
+        """
+        with self.__lock:
+            cells = list(self.__cells.items())
+        return UserStatistics.__count(cells, is_active, is_deleted)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the statistics to a dictionary
+
+        :return: The totals and the number of users created per day, oldest day first
+        """
+        with self.__lock:
+            cells = list(self.__cells.items())
+            created_per_day = list(self.__created_per_day.items())
+        return {
+            "total": UserStatistics.__count(cells),
+            "active": UserStatistics.__count(cells, is_active=True),
+            "inactive": UserStatistics.__count(cells, is_active=False),
+            "deleted": UserStatistics.__count(cells, is_deleted=True),
+            "created_per_day": dict(sorted(created_per_day))
+        }
+
+    def __add(self, user: dict) -> None:
+        self.__cells[UserStatistics.__cell(user)] += 1
+        self.__created_per_day[UserStatistics.__day(user)] += 1
+
+    def __remove(self, user: dict) -> None:
+        self.__cells[UserStatistics.__cell(user)] -= 1
+        day = UserStatistics.__day(user)
+        self.__created_per_day[day] -= 1
+        if not self.__created_per_day[day]:
+            del self.__created_per_day[day]
+
+    @staticmethod
+    def __count(
+        cells: list[tuple[tuple[bool, bool], int]],
+        is_active: Optional[bool] = None,
+        is_deleted: Optional[bool] = None
+    ) -> int:
+        return sum(
+            count for (active, deleted), count in cells
+            if (is_active is None or active == is_active) and (is_deleted is None or deleted == is_deleted)
+        )
+
+    @staticmethod
+    def __cell(user: dict) -> tuple[bool, bool]:
+        return bool(user["is_active"]), user["deleted_at"] is not None
+
+    @staticmethod
+    def __day(user: dict) -> str:
+        # Timestamps are stored as str(datetime), which starts with the ISO date
+        return str(user["created_at"])[:10]
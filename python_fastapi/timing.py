@@ -0,0 +1,236 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from itertools import accumulate
+from typing import Callable, Optional
+
+from fastapi.routing import APIRoute
+
+SERVER_TIMING_HEADER = b"server-timing"
+
+HISTOGRAM_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_request_timings: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+_disabled_stage = nullcontext()
+
+
+class RequestTimings:
+    """
+    Stage durations of a single request, in milliseconds
+    """
+    __slots__ = ("started_at", "endpoint_finished_at", "stages")
+
+    def __init__(self) -> None:
+        """
+        Constructor for RequestTimings class
+        """
+        self.started_at = time.perf_counter()
+        self.endpoint_finished_at: Optional[float] = None
+        self.stages: list[tuple[str, float]] = []
+
+    def record(self, name: str, started_at: float, finished_at: float) -> None:
+        """
+        Record the duration of a stage
+
+        :param name: The name of the stage
+        :param started_at: The perf_counter value the stage started at
+        :param finished_at: The perf_counter value the stage finished at
+        """
+        self.stages.append((name, (finished_at - started_at) * 1000))
+
+    def to_header(self) -> bytes:
+        """
+        Render the stages as a Server-Timing header value
+
+        :return: bytes
+        """
+        return ", ".join(f"{name};dur={duration:.3f}" for name, duration in self.stages).encode("latin-1")
+
+
+class _Stage:
+    __slots__ = ("timings", "name", "started_at")
+
+    def __init__(self, timings: RequestTimings, name: str) -> None:
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.timings.record(self.name, self.started_at, time.perf_counter())
+
+
+def stage(name: str) -> _Stage | nullcontext:
+    """
+    Time a block of code as a named stage of the current request
+
+    Outside a request timed by ServerTimingMiddleware this returns a shared no-op context manager,
+    so instrumented code costs a single context variable lookup when timing is disabled.
+
+    :param name: The name of the stage, as reported in the Server-Timing header
+    :return: A context manager timing the block
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        return _disabled_stage
+    return _Stage(timings, name)
+
+
+class StageHistograms:
+    """
+    Per-stage histograms of the durations reported in Server-Timing headers
+    """
+
+    def __init__(self, buckets_ms: tuple[float, ...] = HISTOGRAM_BUCKETS_MS) -> None:
+        """
+        Constructor for StageHistograms class
+
+        :param buckets_ms: The upper bounds of the buckets, in milliseconds, an overflow bucket is added
+        """
+        self.__buckets_ms = buckets_ms
+        self.__histograms: dict[str, dict] = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, stages: list[tuple[str, float]]) -> None:
+        """
+        Add the stage durations of a request to the histograms
+
+        :param stages: The stages of the request, with their durations in milliseconds
+        """
+        with self.__lock:
+            for name, duration in stages:
+                histogram = self.__histograms.get(name)
+                if histogram is None:
+                    histogram = self.__histograms[name] = {
+                        "count": 0, "sum_ms": 0.0, "counts": [0] * (len(self.__buckets_ms) + 1)
+                    }
+                histogram["count"] += 1
+                histogram["sum_ms"] += duration
+                histogram["counts"][bisect_left(self.__buckets_ms, duration)] += 1
+
+    def to_dict(self) -> dict:
+        """
+        Convert the histograms to a dictionary
+
+        :return: For every stage, the number of observations, their sum and the cumulative bucket counts
+        """
+        labels = [f"le_{bound}" for bound in self.__buckets_ms] + ["le_inf"]
+        with self.__lock:
+            return {
+                name: {
+                    "count": histogram["count"],
+                    "sum_ms": round(histogram["sum_ms"], 3),
+                    "buckets": dict(zip(labels, accumulate(histogram["counts"])))
+                }
+                for name, histogram in self.__histograms.items()
+            }
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware reporting the stages of every request in a Server-Timing header
+
+    Besides the stages recorded with ``stage()``, routes using TimedRoute report ``validation``
+    (routing, body parsing and validation, up to the endpoint call), ``endpoint`` and
+    ``serialization`` (from the endpoint returning to the response starting). ``total`` covers the
+    whole request.
+    """
+
+    def __init__(self, app, histograms: Optional[StageHistograms] = None) -> None:
+        """
+        Constructor for ServerTimingMiddleware class
+
+        :param app: The ASGI application to wrap
+        :param histograms: Histograms to aggregate the stages into, if any
+        """
+        self.app = app
+        self.histograms = histograms
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                if timings.endpoint_finished_at is not None:
+                    timings.record("serialization", timings.endpoint_finished_at, now)
+                timings.record("total", timings.started_at, now)
+                if self.histograms is not None:
+                    self.histograms.observe(timings.stages)
+                message = {**message, "headers": [
+                    *message.get("headers", ()),
+                    (SERVER_TIMING_HEADER, timings.to_header())
+                ]}
+            await send(message)
+
+        token = _request_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+
+
+def time_endpoint(endpoint: Callable) -> Callable:
+    """
+    Wrap an endpoint so it records the validation and endpoint stages of the request
+
+    :param endpoint: The endpoint to wrap, sync or async
+    :return: A wrapper with the same signature, so FastAPI resolves the same parameters
+    """
+    # include_router builds the routes again from their, already wrapped, endpoints
+    if getattr(endpoint, "__timed_endpoint__", False):
+        return endpoint
+
+    def started(timings: RequestTimings) -> float:
+        now = time.perf_counter()
+        timings.record("validation", timings.started_at, now)
+        return now
+
+    def finished(timings: RequestTimings, started_at: float) -> None:
+        timings.endpoint_finished_at = time.perf_counter()
+        timings.record("endpoint", started_at, timings.endpoint_finished_at)
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            timings = _request_timings.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            started_at = started(timings)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finished(timings, started_at)
+    else:
+        @wraps(endpoint)
+        def timed_endpoint(*args, **kwargs):
+            timings = _request_timings.get()
+            if timings is None:
+                return endpoint(*args, **kwargs)
+            started_at = started(timings)
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                finished(timings, started_at)
+
+    timed_endpoint.__timed_endpoint__ = True
+    return timed_endpoint
+
+
+class TimedRoute(APIRoute):
+    """
+    Route whose endpoint reports the validation, endpoint and serialization stages
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        super().__init__(path, time_endpoint(endpoint), **kwargs)
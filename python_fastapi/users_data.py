@@ -1 +1,10 @@
-users = []
+from python_fastapi.change_feed import ChangeFeed
+from python_fastapi.constants import CHANGE_FEED_CAPACITY, SNAPSHOT_MAX_LEASES, SNAPSHOT_TTL_SECONDS
+from python_fastapi.repositories import UserRepository
+from python_fastapi.snapshots import SnapshotLeases
+
+user_repository = UserRepository()
+
+user_changes = ChangeFeed(capacity=CHANGE_FEED_CAPACITY)
+
+user_snapshots = SnapshotLeases(user_repository, ttl_seconds=SNAPSHOT_TTL_SECONDS, max_leases=SNAPSHOT_MAX_LEASES)
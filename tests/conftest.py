@@ -0,0 +1,44 @@
+from typing import Callable, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+from python_fastapi.app import create_app
+
+
+@pytest.fixture
+def client():
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user() -> Callable[..., dict]:
+    def make(
+        user_id: int,
+        email: Optional[str] = None,
+        is_active: bool = True,
+        created_at: str = "2025-01-01 10:00:00.000000+00:00",
+        deleted_at: Optional[str] = None
+    ) -> dict:
+        return {
+            "id": user_id,
+            "email": email or f"user{user_id}@ghs.gov.gh",
+            "username": f"user{user_id}",
+            "is_active": is_active,
+            "created_at": created_at,
+            "updated_at": None,
+            "deleted_at": deleted_at
+        }
+    return make
+
+
+@pytest.fixture
+def create_user(client: TestClient) -> Callable[[str], dict]:
+    def create(name: str) -> dict:
+        response = client.post(
+            "/api/v1/users", json={"username": name, "email": f"{name}@ghs.gov.gh", "password": "secret123"}
+        )
+        assert response.status_code == 201
+        return response.json()["data"]
+    return create
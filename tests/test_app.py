@@ -0,0 +1,46 @@
+import importlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from patient_management_system.app.main import create_app as create_patient_app
+from patient_management_system.app.settings import Settings as PatientSettings
+from python_fastapi.app import create_app
+from python_fastapi.settings import Settings
+
+
+@pytest.mark.parametrize("factory, settings", [
+    (create_app, Settings(prebuild_openapi=True, warm_validators=True)),
+    (create_patient_app, PatientSettings(prebuild_openapi=True, warm_validators=True)),
+])
+def test_lifespan_warms_the_application_up(factory, settings):
+    app = factory(settings)
+    assert app.openapi_schema is None
+
+    with TestClient(app):
+        assert app.openapi_schema is not None
+        assert "/api/v1/users" in app.openapi_schema["paths"]
+
+
+@pytest.mark.parametrize("factory, settings", [
+    (create_app, Settings(prebuild_openapi=False)),
+    (create_patient_app, PatientSettings(prebuild_openapi=False)),
+])
+def test_openapi_is_built_lazily_when_disabled(factory, settings):
+    app = factory(settings)
+
+    with TestClient(app):
+        assert app.openapi_schema is None
+
+
+@pytest.mark.parametrize("module_name", ["python_fastapi.app", "patient_management_system.app.main"])
+def test_module_level_app_is_created_on_first_access(module_name):
+    module = importlib.import_module(module_name)
+
+    app = module.app
+
+    assert isinstance(app, FastAPI)
+    assert module.app is app
+    with pytest.raises(AttributeError):
+        module.missing
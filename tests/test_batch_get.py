@@ -0,0 +1,82 @@
+import pytest
+
+from python_fastapi.constants import BATCH_GET_MAX_IDS
+from python_fastapi.repositories import DuplicateEmailError, DuplicateIdError, UserRepository
+from python_fastapi.users_data import user_repository
+
+
+def test_get_many_preserves_request_order_and_reports_missing_ids(make_user):
+    repository = UserRepository([make_user(user_id) for user_id in (1, 2, 3)])
+
+    found, missing = repository.get_many([3, 7, 1, 3, 5])
+
+    assert [user["id"] for user in found] == [3, 1]
+    assert missing == [7, 5]
+
+
+def test_added_users_are_indexed(make_user):
+    repository = UserRepository()
+    user = repository.add(make_user(42))
+
+    assert repository.get(42) is user
+    assert repository.get(43) is None
+    assert len(repository) == 1
+
+
+def test_duplicate_ids_and_emails_are_rejected_without_storing_anything(make_user):
+    repository = UserRepository([make_user(1)])
+
+    with pytest.raises(DuplicateIdError):
+        repository.add_many([make_user(2), make_user(1, email="other@ghs.gov.gh")])
+    with pytest.raises(DuplicateIdError):
+        repository.add_many([make_user(3), make_user(3, email="other@ghs.gov.gh")])
+    with pytest.raises(DuplicateEmailError):
+        repository.add(make_user(4, email="user1@ghs.gov.gh"))
+
+    assert len(repository) == repository.statistics.count() == 1
+    assert repository.get(2) is None
+
+
+def test_create_draws_a_new_id_when_the_generated_one_is_taken(client, create_user, monkeypatch):
+    taken_id = create_user("takenid")["id"]
+    free_id = max(user["id"] for user in user_repository.users) + 1
+    generated_ids = iter([taken_id, free_id])
+    monkeypatch.setattr("python_fastapi.models.generate_id", lambda: next(generated_ids))
+
+    response = client.post(
+        "/api/v1/users", json={"username": "collision", "email": "collision@ghs.gov.gh", "password": "secret123"}
+    )
+
+    assert response.status_code == 201
+    assert response.json()["data"]["id"] == free_id
+    assert user_repository.get(taken_id)["username"] != "collision"
+
+
+def test_batch_get_endpoint(client):
+    created = [
+        client.post(
+            "/api/v1/users", json={"username": name, "email": f"{name}@ghs.gov.gh", "password": "secret123"}
+        ).json()["data"]
+        for name in ("batcha", "batchb")
+    ]
+    missing_id = -1
+
+    body = client.post(
+        "/api/v1/users:batchGet",
+        params={"fields": "id,username"},
+        json={"ids": [created[1]["id"], missing_id, created[0]["id"]]}
+    ).json()
+
+    assert body["data"] == {
+        "users": [
+            {"id": created[1]["id"], "username": "batchb"},
+            {"id": created[0]["id"], "username": "batcha"}
+        ],
+        "missing_ids": [missing_id]
+    }
+    assert body["extras"] == {"found": 2, "missing": 1}
+
+
+def test_batch_get_endpoint_limits_the_number_of_ids(client):
+    assert client.post("/api/v1/users:batchGet", json={"ids": []}).status_code == 422
+    assert client.post("/api/v1/users:batchGet", json={"ids": list(range(BATCH_GET_MAX_IDS + 1))}).status_code == 422
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+
+from python_fastapi.change_feed import ChangeFeed, stream_server_sent_events
+from python_fastapi.repositories import UserRepository
+from python_fastapi.services import change_publisher
+from python_fastapi.users_data import user_changes
+
+
+def test_publish_assigns_increasing_sequence_numbers():
+    feed = ChangeFeed(capacity=10)
+
+    sequences = [feed.publish("create", user_id, {"id": user_id})["sequence"] for user_id in range(5)]
+
+    assert sequences == [1, 2, 3, 4, 5]
+    assert feed.last_sequence == 5
+    events, resync = feed.read(2, limit=10)
+    assert [event["sequence"] for event in events] == [3, 4, 5]
+    assert resync is False
+
+
+def test_read_respects_limit():
+    feed = ChangeFeed(capacity=10)
+    for user_id in range(5):
+        feed.publish("create", user_id, {"id": user_id})
+
+    events, _ = feed.read(0, limit=2)
+
+    assert [event["sequence"] for event in events] == [1, 2]
+
+
+def test_evicted_position_requires_resync():
+    feed = ChangeFeed(capacity=3)
+    for user_id in range(5):
+        feed.publish("create", user_id, {"id": user_id})
+
+    assert feed.first_sequence == 3
+    assert feed.read(0, limit=10) == ([], True)
+    assert feed.read(1, limit=10) == ([], True)
+    events, resync = feed.read(2, limit=10)
+    assert [event["sequence"] for event in events] == [3, 4, 5]
+    assert resync is False
+
+
+def test_position_ahead_of_feed_requires_resync():
+    feed = ChangeFeed(capacity=3)
+    feed.publish("create", 1, {"id": 1})
+
+    assert feed.read(9999, limit=10) == ([], True)
+    assert feed.read(1, limit=10) == ([], False)
+
+
+def test_wait_wakes_up_on_publish_from_another_thread():
+    feed = ChangeFeed(capacity=3)
+
+    async def wait_for_publish() -> bool:
+        timer = threading.Timer(0.05, feed.publish, args=("create", 1, {"id": 1}))
+        timer.start()
+        return await feed.wait(0, timeout=5)
+
+    assert asyncio.run(wait_for_publish()) is True
+
+
+def test_wait_times_out_without_events():
+    feed = ChangeFeed(capacity=3)
+
+    assert asyncio.run(feed.wait(0, timeout=0.01)) is False
+
+
+def test_stream_resumes_after_last_seen_event():
+    feed = ChangeFeed(capacity=10)
+    for user_id in range(3):
+        feed.publish("create", user_id, {"id": user_id})
+
+    async def first_chunk() -> str:
+        stream = stream_server_sent_events(feed, since=1, batch_size=10, heartbeat_seconds=1)
+        chunk = await anext(stream)
+        await stream.aclose()
+        return chunk
+
+    chunk = asyncio.run(first_chunk())
+
+    assert "id: 1\n" not in chunk
+    assert "id: 2\nevent: create\n" in chunk
+    assert "id: 3\nevent: create\n" in chunk
+
+
+def test_stream_signals_resync_for_evicted_position():
+    feed = ChangeFeed(capacity=2)
+    for user_id in range(4):
+        feed.publish("create", user_id, {"id": user_id})
+
+    async def chunks() -> list[str]:
+        return [chunk async for chunk in stream_server_sent_events(feed, since=0, batch_size=10, heartbeat_seconds=1)]
+
+    assert asyncio.run(chunks()) == ['event: resync\ndata: {"last_sequence": 4}\n\n']
+
+
+def test_changes_endpoint_reports_every_mutation_in_order(client, create_user):
+    since = user_changes.last_sequence
+    user = create_user("feedorder")
+    client.delete(f"/api/v1/users/{user['id']}")
+
+    body = client.get("/api/v1/users/changes", params={"since": since}).json()
+
+    assert [change["operation"] for change in body["data"]] == ["create", "delete"]
+    assert [change["sequence"] for change in body["data"]] == [since + 1, since + 2]
+    assert body["data"][0]["data"].keys() == body["data"][1]["data"].keys()
+    assert body["extras"] == {"resync": False, "next_since": since + 2, "last_sequence": since + 2}
+
+
+def test_changes_endpoint_long_polls_for_new_changes(client, create_user):
+    since = user_changes.last_sequence
+    timer = threading.Timer(0.1, create_user, args=("feedlongpoll",))
+    timer.start()
+
+    body = client.get("/api/v1/users/changes", params={"since": since, "wait": 5}).json()
+    timer.join()
+
+    assert [change["data"]["username"] for change in body["data"]] == ["feedlongpoll"]
+
+
+def test_changes_endpoint_resumes_from_last_event_id(client, create_user):
+    since = user_changes.last_sequence
+    create_user("feedresumea")
+    create_user("feedresumeb")
+
+    body = client.get("/api/v1/users/changes", headers={"Last-Event-ID": str(since + 1)}).json()
+
+    assert [change["data"]["username"] for change in body["data"]] == ["feedresumeb"]
+
+
+def test_changes_endpoint_asks_stale_cursor_to_resync(client):
+    body = client.get("/api/v1/users/changes", params={"since": user_changes.last_sequence + 9999}).json()
+
+    assert body["extras"]["resync"] is True
+    assert body["extras"]["next_since"] == user_changes.last_sequence
+
+
+def test_concurrent_updates_are_published_in_commit_order(make_user):
+    repository = UserRepository([make_user(1)])
+    feed = ChangeFeed(capacity=1000)
+    publish_update = change_publisher(feed, "update")
+
+    def rename(worker: int) -> None:
+        for index in range(100):
+            repository.update(1, {"username": f"worker{worker}n{index}"}, on_commit=publish_update)
+
+    workers = [threading.Thread(target=rename, args=(worker,)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    events, _ = feed.read(0, limit=1000)
+    assert [event["data"]["version"] for event in events] == list(range(2, 402))
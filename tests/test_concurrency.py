@@ -0,0 +1,25 @@
+import asyncio
+import threading
+
+from python_fastapi.concurrency import run_cpu_bound
+from python_fastapi.constants import CPU_BOUND_OFFLOAD_THRESHOLD
+
+
+def current_thread() -> int:
+    return threading.get_ident()
+
+
+def test_cheap_work_runs_on_the_event_loop():
+    async def run():
+        return threading.get_ident(), await run_cpu_bound(current_thread, cost=CPU_BOUND_OFFLOAD_THRESHOLD - 1)
+
+    loop_thread, work_thread = asyncio.run(run())
+    assert work_thread == loop_thread
+
+
+def test_expensive_work_is_moved_to_a_worker_thread():
+    async def run():
+        return threading.get_ident(), await run_cpu_bound(current_thread, cost=CPU_BOUND_OFFLOAD_THRESHOLD)
+
+    loop_thread, work_thread = asyncio.run(run())
+    assert work_thread != loop_thread
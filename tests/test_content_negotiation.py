@@ -0,0 +1,79 @@
+import json
+
+import msgpack
+import pytest
+
+from python_fastapi.content_negotiation import encode_timestamps, to_epoch_microseconds
+
+MESSAGE_PACK = "application/msgpack"
+
+
+def test_timestamps_become_epoch_microseconds():
+    assert to_epoch_microseconds("1970-01-01 00:00:01.000002+00:00") == 1_000_002
+    assert to_epoch_microseconds("1970-01-01T01:00:00") == 3_600_000_000
+    assert encode_timestamps({"data": [{"id": 1, "created_at": "1970-01-01 00:00:00+00:00", "deleted_at": None}]}) == {
+        "data": [{"id": 1, "created_at": 0, "deleted_at": None}]
+    }
+
+
+def test_json_stays_the_default(client, create_user):
+    user = create_user("jsondefault")
+
+    response = client.get(f"/api/v1/users/{user['id']}")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["vary"] == "Accept"
+
+
+def test_responses_are_message_pack_when_accepted(client, create_user):
+    user = create_user("msgpackread")
+
+    as_json = client.get(f"/api/v1/users/{user['id']}").json()
+    response = client.get(f"/api/v1/users/{user['id']}", headers={"Accept": MESSAGE_PACK})
+    as_message_pack = msgpack.unpackb(response.content)
+
+    assert response.headers["content-type"] == MESSAGE_PACK
+    assert as_message_pack["data"]["created_at"] == to_epoch_microseconds(as_json["data"]["created_at"])
+    as_message_pack["data"]["created_at"] = as_json["data"]["created_at"]
+    assert as_message_pack == as_json
+
+
+def test_list_pages_keep_the_envelope(client, create_user):
+    create_user("msgpacklist")
+
+    response = client.get("/api/v1/users", params={"page": 1, "page_size": 5}, headers={"Accept": MESSAGE_PACK})
+    body = msgpack.unpackb(response.content)
+
+    assert body.keys() == client.get("/api/v1/users", params={"page": 1, "page_size": 5}).json().keys()
+    assert all(isinstance(user["created_at"], int) for user in body["data"])
+
+
+def test_writes_accept_message_pack_bodies(client):
+    payload = {"username": "msgpackwrite", "email": "msgpackwrite@ghs.gov.gh", "password": "secret123"}
+
+    created = client.post(
+        "/api/v1/users",
+        content=msgpack.packb(payload),
+        headers={"Content-Type": MESSAGE_PACK, "Accept": MESSAGE_PACK}
+    )
+    assert created.status_code == 201
+    user = msgpack.unpackb(created.content)["data"]
+    assert user["username"] == payload["username"]
+
+    patched = client.patch(
+        f"/api/v1/users/{user['id']}", content=msgpack.packb({"username": "msgpackpatched"}),
+        headers={"Content-Type": MESSAGE_PACK}
+    )
+    assert patched.status_code == 200
+    assert patched.json()["data"]["username"] == "msgpackpatched"
+
+
+@pytest.mark.parametrize("body, status_code", [
+    (b"\xc1", 400),
+    (msgpack.packb({"username": "invalid"}), 422),
+])
+def test_invalid_message_pack_bodies_are_rejected(client, body, status_code):
+    response = client.post("/api/v1/users", content=body, headers={"Content-Type": MESSAGE_PACK})
+
+    assert response.status_code == status_code
+    json.loads(response.content)
@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from python_fastapi.idempotency import IdempotencyCache
+
+
+def completed(result):
+    async def operation():
+        return result
+    return operation
+
+
+def test_replay_is_served_from_cache():
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=10)
+    calls = []
+
+    async def create():
+        calls.append(1)
+        return "created"
+
+    first = asyncio.run(cache.execute("key", "request", create))
+    second = asyncio.run(cache.execute("key", "request", create))
+
+    assert first == ("created", False)
+    assert second == ("created", True)
+    assert len(calls) == 1
+
+
+def test_key_reused_for_another_request_is_rejected():
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=10)
+    asyncio.run(cache.execute("key", "request", completed("created")))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(cache.execute("key", "another request", completed("created")))
+
+    assert error.value.status_code == 422
+
+
+def test_failed_operation_is_not_cached():
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=10)
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.execute("key", "request", fail))
+
+    assert asyncio.run(cache.execute("key", "request", completed("created"))) == ("created", False)
+
+
+def test_concurrent_duplicates_wait_for_the_request_in_flight():
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=10)
+    calls = []
+
+    async def slow_create():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "created"
+
+    async def send_duplicates():
+        return await asyncio.gather(*(cache.execute("key", "request", slow_create) for _ in range(4)))
+
+    results = asyncio.run(send_duplicates())
+
+    assert len(calls) == 1
+    assert results == [("created", False)] + [("created", True)] * 3
+
+
+def test_duplicates_of_a_failed_request_run_it_again():
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=10)
+    calls = []
+
+    async def fail_first():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return "created"
+
+    async def send_duplicates():
+        return await asyncio.gather(
+            *(cache.execute("key", "request", fail_first) for _ in range(2)), return_exceptions=True)
+
+    first, second = asyncio.run(send_duplicates())
+
+    assert isinstance(first, RuntimeError)
+    assert second == ("created", False)
+    assert len(calls) == 2
+
+
+def test_expired_entries_run_again():
+    cache = IdempotencyCache(ttl_seconds=0.01, max_entries=10)
+    asyncio.run(cache.execute("key", "request", completed("first")))
+    time.sleep(0.02)
+
+    assert asyncio.run(cache.execute("key", "request", completed("second"))) == ("second", False)
+    assert len(cache) == 1
+
+
+def test_oldest_entries_are_evicted_past_the_size_limit():
+    cache = IdempotencyCache(ttl_seconds=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        asyncio.run(cache.execute(key, "request", completed(key)))
+
+    assert len(cache) == 2
+    assert asyncio.run(cache.execute("a", "request", completed("a again"))) == ("a again", False)
+    assert asyncio.run(cache.execute("c", "request", completed("c again"))) == ("c", True)
+
+
+def test_retried_create_is_replayed(client):
+    payload = {"username": "idempotent", "email": "idempotent@ghs.gov.gh", "password": "secret123"}
+    headers = {"Idempotency-Key": "create-idempotent"}
+
+    first = client.post("/api/v1/users", json=payload, headers=headers)
+    retry = client.post("/api/v1/users", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+
+def test_create_without_key_is_not_deduplicated(client):
+    payload = {"username": "notidempotent", "email": "notidempotent@ghs.gov.gh", "password": "secret123"}
+
+    assert client.post("/api/v1/users", json=payload).status_code == 201
+    assert client.post("/api/v1/users", json=payload).status_code == 400
@@ -0,0 +1,71 @@
+import subprocess
+import sys
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from patient_management_system.app.main import create_app as create_patient_app
+from python_fastapi.app import create_app
+from python_fastapi.middlewares import RequestContextMiddleware, correlation_id
+
+
+def test_response_carries_generated_ids_and_timing():
+    with TestClient(create_app()) as client:
+        response = client.get("/api/v1/users")
+
+    assert len(response.headers["X-Request-ID"]) == 32
+    assert response.headers["X-Correlation-ID"] == response.headers["X-Request-ID"]
+    assert response.headers["X-Response-ID"] != response.headers["X-Request-ID"]
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_incoming_ids_are_propagated_to_state_context_and_response():
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    seen = {}
+
+    @app.get("/context")
+    def context(request: Request) -> dict:
+        seen.update(state=request.state.correlation_id, context=correlation_id.get())
+        return {}
+
+    with TestClient(app) as client:
+        response = client.get("/context", headers={"X-Request-ID": "req-1", "X-Correlation-ID": "corr-1"})
+
+    assert response.headers["X-Request-ID"] == "req-1"
+    assert response.headers["X-Correlation-ID"] == "corr-1"
+    assert seen == {"state": "corr-1", "context": "corr-1"}
+    assert correlation_id.get() is None
+
+
+def test_streaming_body_is_passed_through():
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    with TestClient(app) as client:
+        response = client.get("/stream")
+
+    assert response.text == "abc"
+    assert "X-Request-ID" in response.headers
+
+
+def test_patient_management_system_uses_the_middleware():
+    with TestClient(create_patient_app()) as client:
+        response = client.get("/api/v1/users/1", headers={"X-Correlation-ID": "corr-2"})
+
+    assert response.headers["X-Correlation-ID"] == "corr-2"
+
+
+def test_patient_management_system_does_not_depend_on_python_fastapi():
+    probe = (
+        "import sys\n"
+        "from patient_management_system.app.main import create_app\n"
+        "create_app()\n"
+        "assert not [name for name in sys.modules if name.startswith('python_fastapi')]\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], check=True)
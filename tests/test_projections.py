@@ -0,0 +1,41 @@
+import pytest
+from fastapi import HTTPException
+
+from python_fastapi.projections import get_user_serializer, parse_user_fields
+
+
+def test_projection_is_canonical():
+    assert parse_user_fields("username, id,username") == ("username", "id")
+    assert parse_user_fields("id,username") == parse_user_fields("username,id")
+    assert parse_user_fields(None) is None
+    assert parse_user_fields(",") is None
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as error:
+        parse_user_fields("id,password")
+
+    assert error.value.status_code == 400
+
+
+def test_serializers_are_compiled_once_per_projection():
+    assert get_user_serializer(("id",)) is get_user_serializer(("id",))
+    assert get_user_serializer(("id",))({"id": 1, "username": "abcd"}) == {"id": 1}
+    assert get_user_serializer(("username", "id"))({"id": 1, "username": "abcd"}) == {"username": "abcd", "id": 1}
+
+
+def test_endpoints_return_only_requested_fields(client):
+    created = client.post(
+        "/api/v1/users", json={"username": "projected", "email": "projected@ghs.gov.gh", "password": "secret123"}
+    ).json()["data"]
+
+    listed = client.get("/api/v1/users", params={"fields": "id,username"}).json()["data"]
+    single = client.get(f"/api/v1/users/{created['id']}", params={"fields": "is_active"}).json()["data"]
+
+    assert {"id": created["id"], "username": "projected"} in listed
+    assert all(user.keys() == {"username", "id"} for user in listed)
+    assert single == {"is_active": created["is_active"]}
+
+
+def test_endpoints_reject_unknown_fields(client):
+    assert client.get("/api/v1/users", params={"fields": "password"}).status_code == 400
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from python_fastapi.app import create_app
+from python_fastapi.repositories import UserRepository
+from python_fastapi.schemas import CreateUserSchema, ReadUserSchema
+from python_fastapi.seed import generate_users, load_users, write_csv, write_ndjson
+from python_fastapi.settings import Settings
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def generate(count: int, seed: int = 7, batch_size: int = 1000) -> list[dict]:
+    return [user for batch in generate_users(count, seed, batch_size=batch_size, now=NOW) for user in batch]
+
+
+def test_generated_users_are_valid_and_unique():
+    users = generate(5000)
+
+    for user in users:
+        CreateUserSchema.model_validate(user)
+        ReadUserSchema.model_validate(user)
+    assert len({user["id"] for user in users}) == len(users)
+    assert len({user["email"] for user in users}) == len(users)
+
+
+def test_generated_users_mix_statuses_and_keep_timestamps_ordered():
+    users = generate(5000)
+
+    assert 0.6 < sum(user["is_active"] for user in users) / len(users) < 0.8
+    assert any(user["deleted_at"] for user in users)
+    assert any(user["updated_at"] for user in users)
+    for user in users:
+        created_at = datetime.fromisoformat(user["created_at"])
+        assert created_at <= NOW
+        if user["updated_at"]:
+            assert created_at <= datetime.fromisoformat(user["updated_at"]) <= NOW
+        if user["deleted_at"]:
+            assert user["deleted_at"] == user["updated_at"]
+
+
+def test_generation_is_reproducible_and_independent_of_batch_size():
+    assert generate(2500, seed=1, batch_size=1000) == generate(2500, seed=1, batch_size=1000)
+    assert generate(2500, seed=1) != generate(2500, seed=2)
+    assert generate(2500, batch_size=700) == generate(2500, batch_size=10_000)
+    assert [len(batch) for batch in generate_users(2500, batch_size=700, now=NOW)] == [700, 700, 700, 400]
+
+
+def test_load_users_indexes_and_counts():
+    repository = UserRepository()
+
+    loaded = load_users(repository, generate_users(3000, batch_size=1000, now=NOW))
+
+    assert loaded == len(repository) == repository.statistics.count() == 3000
+    assert repository.get(repository.users[-1]["id"]) is repository.users[-1]
+
+
+def test_fixture_writers():
+    users = generate(10)
+    ndjson = io.StringIO()
+    csv_file = io.StringIO(newline="")
+
+    assert write_ndjson([users], ndjson) == 10
+    assert write_csv([users], csv_file) == 10
+
+    assert [json.loads(line) for line in ndjson.getvalue().splitlines()] == users
+    rows = list(csv.DictReader(io.StringIO(csv_file.getvalue())))
+    assert [row["email"] for row in rows] == [user["email"] for user in users]
+    assert rows[0]["updated_at"] == (users[0]["updated_at"] or "")
+
+
+def test_app_can_seed_on_startup():
+    with TestClient(create_app(Settings(seed_users=50, seed=3))) as client:
+        stats = client.get("/api/v1/users/stats").json()["data"]
+
+    assert stats["total"] >= 50
@@ -0,0 +1,102 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+
+from patient_management_system.app import server as patient_server
+from patient_management_system.app.main import create_app as create_patient_app
+from patient_management_system.app.settings import Settings as PatientSettings
+from python_fastapi import server
+from python_fastapi.app import create_app
+from python_fastapi.settings import Settings
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FACTORIES = [
+    (create_app, Settings(prebuild_openapi=False)),
+    (create_patient_app, PatientSettings(prebuild_openapi=False)),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize("factory, settings", FACTORIES)
+def test_readiness_follows_the_lifespan(factory, settings):
+    app = factory(settings)
+    client = TestClient(app)
+
+    assert client.get("/health/ready").status_code == 503
+    with client:
+        assert client.get("/health/ready").status_code == 200
+    assert client.get("/health/ready").status_code == 503
+
+
+@pytest.mark.parametrize("module, factory, settings", [
+    (server, *FACTORIES[0]),
+    (patient_server, *FACTORIES[1]),
+])
+def test_shutdown_withdraws_readiness_before_draining(module, factory, settings):
+    app = factory(settings)
+    app.state.ready = True
+    draining = module.DrainingServer(uvicorn.Config(app), app)
+
+    draining.handle_exit(signal.SIGTERM, None)
+
+    assert not app.state.ready
+    assert draining.should_exit
+
+
+@pytest.mark.parametrize("module", [server, patient_server])
+def test_bind_socket_sets_reuse_port(module):
+    port = free_port()
+    first = module.bind_socket("127.0.0.1", port, backlog=16, reuse_port=True)
+    second = module.bind_socket("127.0.0.1", port, backlog=16, reuse_port=True)
+    try:
+        assert first.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT)
+        assert second.getsockname() == first.getsockname()
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.parametrize("module", [server, patient_server])
+def test_defaults_fit_the_host(module):
+    assert 1 <= module.available_cores() <= (os.cpu_count() or 1)
+    assert module.event_loop() in ("uvloop", "asyncio")
+    assert module.http_protocol() in ("httptools", "h11")
+
+
+@pytest.mark.parametrize("package", ["python_fastapi", "patient_management_system"])
+def test_serve_becomes_ready_and_exits_cleanly_on_sigterm(package):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", package, "serve", "--port", str(port), "--workers", "2"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health/ready").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            assert time.monotonic() < deadline, "the server never became ready"
+            time.sleep(0.1)
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=20) == 0
+    finally:
+        process.kill()
@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from python_fastapi.repositories import SnapshotExpiredError, UserRepository
+from python_fastapi.services import list_users
+from python_fastapi.snapshots import SnapshotLeases
+from python_fastapi.users_data import user_snapshots
+
+
+def test_updates_store_a_new_version_instead_of_mutating_the_user(make_user):
+    repository = UserRepository([make_user(1)])
+    original = repository.get(1)
+
+    updated, _ = repository.update(1, {"username": "renamed"})
+
+    assert original["username"] == "user1"
+    assert updated is not original
+    assert repository.get(1) is updated is repository.users[0]
+
+
+def test_pinned_commit_hides_later_writes_until_unpinned(make_user):
+    repository = UserRepository([make_user(1), make_user(2)])
+    commit = repository.pin()
+
+    repository.update(1, {"username": "renamed"})
+    repository.update(1, {"username": "renamed again"})
+    repository.add(make_user(3))
+
+    assert [user["username"] for user in repository.users_at(commit)] == ["user1", "user2"]
+    assert [user["username"] for user in repository.users] == ["renamed again", "user2", "user3"]
+
+    repository.unpin(commit)
+    later = repository.pin()
+    assert [user["username"] for user in repository.users_at(later)] == ["renamed again", "user2", "user3"]
+
+
+def test_versions_are_reclaimed_once_no_pin_needs_them(make_user):
+    repository = UserRepository([make_user(1)])
+    first = repository.pin()
+    repository.update(1, {"username": "second"})
+    second = repository.pin()
+    repository.update(1, {"username": "third"})
+
+    repository.unpin(first)
+    assert [user["username"] for user in repository.users_at(second)] == ["second"]
+    with pytest.raises(SnapshotExpiredError):
+        repository.users_at(first)
+
+    repository.unpin(second)
+    repository.update(1, {"username": "fourth"})
+    assert repository.users_at(repository.pin())[0]["username"] == "fourth"
+
+
+def test_leases_expire_and_release_their_pin(make_user):
+    repository = UserRepository([make_user(1)])
+    leases = SnapshotLeases(repository, ttl_seconds=0.01, max_leases=2)
+
+    token, commit = leases.acquire()
+    assert leases.renew(token) == commit
+    time.sleep(0.02)
+
+    assert leases.renew(token) is None
+    assert len(leases) == 0
+    assert leases.release(token) is False
+
+
+def test_leases_beyond_the_cap_release_the_least_recently_used():
+    leases = SnapshotLeases(UserRepository(), ttl_seconds=60, max_leases=2)
+    first, _ = leases.acquire()
+    second, _ = leases.acquire()
+    leases.renew(first)
+    leases.acquire()
+
+    assert leases.renew(second) is None
+    assert leases.renew(first) is not None
+
+
+def test_pages_of_a_snapshot_are_consistent_across_writes(client, create_user):
+    for index in range(3):
+        create_user(f"snapshot{index}{time.monotonic_ns()}")
+
+    first_page = client.get("/api/v1/users", params={"page": 1, "page_size": 2, "snapshot": "new"}).json()
+    token = first_page["extras"]["snapshot"]
+    total = first_page["extras"]["total_users"]
+
+    renamed = client.get("/api/v1/users", params={"page": 2, "page_size": 2}).json()["data"][0]
+    client.patch(
+        f"/api/v1/users/{renamed['id']}",
+        json={"username": "renamed"},
+        headers={"Content-Type": "application/merge-patch+json"}
+    )
+    create_user(f"after{time.monotonic_ns()}")
+
+    second_page = client.get("/api/v1/users", params={"page": 2, "page_size": 2, "snapshot": token}).json()
+
+    assert second_page["extras"]["total_users"] == total
+    assert second_page["data"][0]["username"] == renamed["username"]
+    assert client.delete(f"/api/v1/users/snapshots/{token}").status_code == 204
+    assert user_snapshots.renew(token) is None
+
+
+def test_unknown_snapshot_is_gone(client):
+    response = client.get("/api/v1/users", params={"snapshot": "not-a-token"})
+    assert response.status_code == 410
+
+    assert client.delete("/api/v1/users/snapshots/not-a-token").status_code == 404
+
+
+def test_reading_a_released_commit_is_an_expired_snapshot(make_user):
+    repository = UserRepository([make_user(1)])
+    commit = repository.pin()
+    repository.update(1, {"username": "renamed"})
+    repository.unpin(commit)
+
+    with pytest.raises(SnapshotExpiredError):
+        repository.users_at(commit)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(list_users(repository, commit=commit))
+    assert error.value.status_code == 410
+
+
+def test_a_read_keeps_its_commit_readable_while_the_lease_is_released(make_user, monkeypatch):
+    repository = UserRepository([make_user(1), make_user(2)])
+    lease = repository.pin()
+    repository.update(1, {"username": "renamed"})
+    version_at = repository._UserRepository__version_at
+
+    def release_lease_then_look_up(position, commit):
+        # Another request releases the lease while this read is going through the users
+        repository.unpin(lease)
+        monkeypatch.setattr(repository, "_UserRepository__version_at", version_at)
+        return version_at(position, commit)
+
+    monkeypatch.setattr(repository, "_UserRepository__version_at", release_lease_then_look_up)
+
+    assert [user["username"] for user in repository.users_at(lease)] == ["user1", "user2"]
+    with pytest.raises(SnapshotExpiredError):
+        repository.users_at(lease)
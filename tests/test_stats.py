@@ -0,0 +1,69 @@
+import threading
+
+from python_fastapi.repositories import UserRepository
+
+
+def test_counters_follow_adds_and_updates(make_user):
+    repository = UserRepository([
+        make_user(1, is_active=True, created_at="2025-01-01 10:00:00.000000+00:00"),
+        make_user(2, is_active=False, created_at="2025-01-01 11:00:00.000000+00:00"),
+        make_user(3, is_active=True, created_at="2025-01-02 10:00:00.000000+00:00"),
+    ])
+
+    repository.update(3, {"deleted_at": "2025-01-03 10:00:00.000000+00:00"})
+    repository.update(2, {"is_active": True})
+
+    assert repository.statistics.to_dict() == {
+        "total": 3,
+        "active": 3,
+        "inactive": 0,
+        "deleted": 1,
+        "created_per_day": {"2025-01-01": 2, "2025-01-02": 1}
+    }
+    assert repository.statistics.count(is_active=True, is_deleted=False) == 2
+
+
+def test_updating_a_missing_user_changes_nothing(make_user):
+    repository = UserRepository([make_user(1, is_active=True, created_at="2025-01-01 10:00:00.000000+00:00")])
+
+    assert repository.update(2, {"is_active": False}) == (None, frozenset())
+    assert repository.statistics.count(is_active=True) == 1
+
+
+def test_stats_endpoint_and_filtered_totals(client):
+    before = client.get("/api/v1/users/stats").json()["data"]
+    created = client.post(
+        "/api/v1/users", json={"username": "counted", "email": "counted@ghs.gov.gh", "password": "secret123"}
+    ).json()["data"]
+    client.delete(f"/api/v1/users/{created['id']}")
+
+    after = client.get("/api/v1/users/stats").json()["data"]
+    deleted_page = client.get("/api/v1/users", params={"is_deleted": True})
+
+    assert after["total"] == before["total"] + 1
+    assert after["deleted"] == before["deleted"] + 1
+    assert sum(after["created_per_day"].values()) == after["total"]
+    assert deleted_page.json()["extras"]["total_users"] == after["deleted"]
+    assert created["id"] in [user["id"] for user in deleted_page.json()["data"]]
+
+
+def test_counters_can_be_read_while_users_are_updated(make_user):
+    repository = UserRepository([make_user(1, created_at="2025-01-01 10:00:00.000000+00:00")])
+    stop = threading.Event()
+
+    def toggle():
+        created_at = ["2025-01-02 10:00:00.000000+00:00", "2025-01-01 10:00:00.000000+00:00"]
+        while not stop.is_set():
+            repository.update(1, {"created_at": created_at[0]})
+            created_at.reverse()
+
+    writer = threading.Thread(target=toggle)
+    writer.start()
+    try:
+        for _ in range(20_000):
+            statistics = repository.statistics.to_dict()
+            assert statistics["total"] == 1
+            assert sum(statistics["created_per_day"].values()) == 1
+    finally:
+        stop.set()
+        writer.join()
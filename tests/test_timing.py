@@ -0,0 +1,67 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from python_fastapi.app import create_app
+from python_fastapi.settings import Settings
+from python_fastapi.timing import StageHistograms, stage, time_endpoint
+
+
+def stage_names(header: str) -> list[str]:
+    return [entry.split(";")[0] for entry in header.split(", ")]
+
+
+def test_server_timing_header_breaks_down_stages():
+    with TestClient(create_app(Settings(server_timing=True))) as client:
+        response = client.post(
+            "/api/v1/users", json={"username": "timed", "email": "timed@ghs.gov.gh", "password": "secret123"}
+        )
+
+    assert stage_names(response.headers["Server-Timing"]) == [
+        "validation", "service", "endpoint", "serialization", "total"
+    ]
+    durations = dict(entry.split(";dur=") for entry in response.headers["Server-Timing"].split(", "))
+    assert all(float(duration) >= 0 for duration in durations.values())
+
+
+def test_server_timing_can_be_disabled():
+    with TestClient(create_app(Settings(server_timing=False))) as client:
+        response = client.get("/api/v1/users")
+
+    assert "Server-Timing" not in response.headers
+    assert client.app.state.stage_histograms is None
+
+
+def test_stage_is_a_no_op_outside_a_timed_request():
+    assert stage("service") is stage("other")
+    with stage("service"):
+        pass
+
+
+def test_timed_endpoint_is_only_wrapped_once():
+    async def endpoint() -> str:
+        return "ok"
+
+    wrapped = time_endpoint(endpoint)
+
+    assert time_endpoint(wrapped) is wrapped
+    assert asyncio.run(wrapped()) == "ok"
+
+
+def test_histograms_are_cumulative():
+    histograms = StageHistograms(buckets_ms=(1, 10))
+
+    histograms.observe([("service", 0.5), ("service", 5), ("service", 50)])
+
+    assert histograms.to_dict() == {
+        "service": {"count": 3, "sum_ms": 55.5, "buckets": {"le_1": 1, "le_10": 2, "le_inf": 3}}
+    }
+
+
+def test_histograms_endpoint():
+    with TestClient(create_app(Settings(server_timing_histograms=True))) as client:
+        client.get("/api/v1/users")
+        data = client.get("/api/v1/metrics/server-timing").json()["data"]
+
+    assert data["service"]["count"] == 1
+    assert data["total"]["count"] >= 1
@@ -0,0 +1,87 @@
+import pytest
+
+from python_fastapi.repositories import DuplicateEmailError, UserRepository
+from python_fastapi.users_data import user_changes, user_repository
+
+MERGE_PATCH = {"Content-Type": "application/merge-patch+json"}
+
+
+def test_update_writes_only_changed_fields_and_bumps_the_version(make_user):
+    repository = UserRepository([make_user(1, "one@ghs.gov.gh", is_active=False)])
+
+    user, changed = repository.update(1, {"username": "renamed", "is_active": False})
+
+    assert changed == {"username"}
+    assert user["version"] == 2
+    assert user["updated_at"] is not None
+    assert repository.get(1) is user
+
+
+def test_noop_update_keeps_the_version(make_user):
+    repository = UserRepository([make_user(1, "one@ghs.gov.gh", is_active=False)])
+
+    user, changed = repository.update(1, {"username": "user1"})
+
+    assert changed == frozenset()
+    assert user["version"] == 1
+    assert user["updated_at"] is None
+
+
+def test_email_change_moves_the_email_index(make_user):
+    repository = UserRepository([
+        make_user(1, "one@ghs.gov.gh", is_active=False),
+        make_user(2, "two@ghs.gov.gh", is_active=False)
+    ])
+
+    repository.update(1, {"email": "uno@ghs.gov.gh"})
+
+    assert repository.get_by_email("one@ghs.gov.gh") is None
+    assert repository.get_by_email("uno@ghs.gov.gh") is repository.get(1)
+    with pytest.raises(DuplicateEmailError):
+        repository.update(1, {"email": "two@ghs.gov.gh"})
+
+
+def test_put_replaces_and_persists(client, create_user):
+    user = create_user("putuser")
+
+    response = client.put(f"/api/v1/users/{user['id']}", json={"username": "putrenamed"})
+
+    assert response.status_code == 200
+    assert response.json()["data"]["username"] == "putrenamed"
+    assert client.get(f"/api/v1/users/{user['id']}").json()["data"]["username"] == "putrenamed"
+
+
+def test_merge_patch_changes_only_the_given_fields(client, create_user):
+    user = create_user("patchuser")
+    active_before = user_repository.statistics.count(is_active=True)
+
+    response = client.patch(f"/api/v1/users/{user['id']}", content=b'{"is_active": true}', headers=MERGE_PATCH)
+
+    data = response.json()["data"]
+    assert response.status_code == 200
+    assert response.headers["Accept-Patch"] == "application/merge-patch+json"
+    assert data["username"] == "patchuser"
+    assert data["is_active"] is True
+    assert data["version"] == user["version"] + 1
+    assert user_repository.statistics.count(is_active=True) == active_before + 1
+
+
+def test_noop_patch_is_not_published(client, create_user):
+    user = create_user("noopuser")
+    since = user_changes.last_sequence
+
+    response = client.patch(f"/api/v1/users/{user['id']}", json={"username": "noopuser"})
+
+    assert response.json()["data"]["version"] == user["version"]
+    assert user_changes.last_sequence == since
+
+
+def test_merge_patch_rejects_null_unknown_and_duplicate_values(client, create_user):
+    user = create_user("strictuser")
+    create_user("takenuser")
+    path = f"/api/v1/users/{user['id']}"
+
+    assert client.patch(path, content=b'{"username": null}', headers=MERGE_PATCH).status_code == 422
+    assert client.patch(path, content=b'{"password": "secret123"}', headers=MERGE_PATCH).status_code == 422
+    assert client.patch(path, json={"email": "takenuser@ghs.gov.gh"}).status_code == 400
+    assert client.patch("/api/v1/users/-1", json={"username": "nobody"}).status_code == 404